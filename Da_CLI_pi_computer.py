@@ -1,184 +1,538 @@
-from decimal import getcontext, Decimal
 import time
 import argparse
 import sys
 import os
-from datetime import timedelta
+import pickle
+import json
+import math
+import platform
+import statistics
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
 
-class PiCalculator:
+from pi_core.engine import (gmpy2, ENGINES, TERMINATIONS, SERIES_METHODS, REFERENCE_FILE,
+                            DEFAULT_CACHE_MAX_BYTES, PiCalculator, write_decimal, format_time, peak_memory)
+from pi_core.packed import OUTPUT_FORMATS, PackedDigits, write_packed
+from pi_core.bbp import BBP_CHUNK_DIGITS, bbp_hex_digits, spot_check
+
+# Bench: an engine's time is assumed to grow with digits**exponent until two points are measured
+BENCH_DEFAULT_EXPONENT = 2
+
+def save_result(value, digits, filename="pi.txt", output_format="text"):
+    """Save the result to a file, streaming the digits in chunks"""
+    try:
+        if output_format == "packed":
+            write_packed(value, digits, filename)
+        else:
+            with open(filename, "w") as f:
+                write_decimal(value, f, digits)
+        print(f"\nResult saved to {filename}")
+    except Exception as e:
+        print(f"\nError saving file: {str(e)}")
+
+class PhaseProfiler:
+    """Collects PiCalculator profile events and reports them as a table or a Chrome trace"""
+    
     def __init__(self):
-        self.running = False
-        self.precision = 100
-        self.current_value = None
-        self.start_time = None
-        self.pi = None
-        
-    def verify_result(self, calculated_pi):
-        """Verify calculated pi against actual pi for precision <= 10000"""
-        if self.precision > 10000:
-            return None
-            
-        try:
-            with open("Da_actual_pi.txt", "r") as f:
-                actual_pi = f.read().strip()
-                # Convert actual pi to Decimal and round to same precision
-                actual_decimal = Decimal(actual_pi)
-                getcontext().prec = self.precision
-                actual_rounded = +actual_decimal  # This forces rounding to current precision
-                
-                # For n digits total, we want "3." plus (n-1) digits after decimal
-                comparison_length = self.precision + 1  # +1 for decimal point
-                calculated_str = str(calculated_pi)[:comparison_length]
-                actual_str = str(actual_rounded)[:comparison_length]
-                
-                if calculated_str == actual_str:
-                    return True, None
-                else:
-                    # Find first difference
-                    for i, (c1, c2) in enumerate(zip(calculated_str, actual_str)):
-                        if c1 != c2:
-                            position = i
-                            break
-                    return False, position
-        except FileNotFoundError:
-            return None
-        except Exception as e:
-            return None
-        
-    def calculate_pi(self):
-        self.running = True
-        self.start_time = time.time_ns()
-        
-        excess_prec = 2
-        prec_cur = 100 if self.precision > 100 else self.precision
-        getcontext().prec = prec_cur + excess_prec
-        
-        second = Decimal(3)  # Current element for PI
-        queue_cur = [Decimal(0), Decimal(0), Decimal(0), second]
-        
-        qq_append = queue_cur.append
-        qq_pop = queue_cur.pop
-        
-        limit = Decimal(10) ** (-prec_cur - excess_prec)
-        iteration = 0
-        last_update = 0
-        
-        print(f"Calculating π to {self.precision} digits...")
-        print("Progress: 0%", end='\r')
+        self.events = []
+        self.origin_ns = time.perf_counter_ns()
+    
+    def __call__(self, event):
+        self.events.append(event)
+    
+    @contextmanager
+    def phase(self, name, level=None):
+        """Time a block of code outside the engine as one more phase"""
+        start_ns = time.perf_counter_ns()
+        yield
+        self.events.append({"phase": name, "level": level, "iteration": None, "terms": None,
+                            "start_ns": start_ns, "elapsed_ns": time.perf_counter_ns() - start_ns})
+    
+    def print_table(self):
+        """Print time per phase and precision level, in order of first appearance"""
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault((event["phase"], event["level"]), [0, 0, 0])
+            row[0] += 1
+            row[1] += event["elapsed_ns"]
+            row[2] += event["terms"] or 0
+        total_ns = sum(row[1] for row in rows.values()) or 1
         
-        while self.running:
-            sec_sq = second * second
-            term = second
-            acc = second + term
-            count = Decimal(1)
+        print(f"\n{'phase':<16} {'level':>10} {'calls':>7} {'terms':>10} {'total ms':>12} {'share':>7}")
+        for (phase, level), (calls, elapsed_ns, terms) in rows.items():
+            level_text = "-" if level is None else str(level)
+            terms_text = str(terms) if terms else "-"
+            print(f"{phase:<16} {level_text:>10} {calls:>7} {terms_text:>10} "
+                  f"{elapsed_ns / 1_000_000:>12.3f} {elapsed_ns / total_ns:>7.1%}")
+    
+    def write_trace(self, path):
+        """Write the events in Chrome trace format (chrome://tracing, Perfetto)"""
+        trace_events = []
+        for event in self.events:
+            trace_events.append({
+                "name": event["phase"],
+                "cat": "pi",
+                "ph": "X",
+                "ts": (event["start_ns"] - self.origin_ns) / 1000,
+                "dur": event["elapsed_ns"] / 1000,
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {k: event[k] for k in ("level", "iteration", "terms") if event[k] is not None},
+            })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+def compare_engines(calculator, result, first_elapsed, engine):
+    """Run a second engine at the same precision and report speed and agreement
+    
+    first_elapsed is the time of the first engine alone, measured when it
+    returned, so printing, verification and checks are not counted.
+    """
+    first_engine = calculator.engine
+    
+    other = PiCalculator()
+    other.precision = calculator.precision
+    other.engine = engine
+    other.workers = calculator.workers
+    other.termination = calculator.termination
+    other.series_method = calculator.series_method
+    other.max_memory = calculator.max_memory
+    print(f"\nComparing with {engine}...")
+    other_result = other.calculate_pi()
+    other_elapsed = (time.time_ns() - other.start_time) / 1_000_000_000
+    if other_result is None:
+        print("Comparison stopped.")
+        return
+    
+    print(f"{first_engine}: {format_time(first_elapsed)}")
+    print(f"{engine}: {format_time(other_elapsed)}")
+    if other_elapsed > 0:
+        print(f"Speedup of {engine} over {first_engine}: {first_elapsed / other_elapsed:.2f}x")
+    
+    if result == other_result:  # Same precision, so equal values print the same digits
+        print("✓ Both engines produced identical digits")
+    else:
+        result_str = str(result)
+        other_str = str(other_result)
+        position = next((i for i, (c1, c2) in enumerate(zip(result_str, other_str)) if c1 != c2),
+                        min(len(result_str), len(other_str)))
+        print(f"✗ Engines differ at position {position} (counting from 0)")
+
+def report_checkpoint(calculator):
+    """Tell the user how to pick up a stopped calculation"""
+    if calculator.checkpoint_path and os.path.exists(calculator.checkpoint_path):
+        print(f"Checkpoint saved to {calculator.checkpoint_path} "
+              f"(continue with --resume {calculator.checkpoint_path})")
+
+def bench_calculator(engine, digits, workers, termination, series_method):
+    """A PiCalculator set up for one bench run"""
+    calculator = PiCalculator()
+    calculator.precision = digits
+    calculator.engine = engine
+    calculator.workers = workers
+    calculator.termination = termination
+    calculator.series_method = series_method
+    return calculator
+
+def bench_trial(engine, digits, workers, termination="fixpoint", series_method="taylor", warmup=0):
+    """One benchmark run in a fresh process so peak RSS is not inflated by other points
+    
+    warmup discarded runs of the same computation come first in the same
+    process, so imports, caches and the allocator are warm for the measured
+    run. The peak RSS covers those runs too: it is the peak of this
+    computation over all its runs, not of the measured run alone.
+    """
+    for _ in range(warmup):
+        bench_calculator(engine, digits, workers, termination, series_method).calculate_pi()
+    
+    calculator = bench_calculator(engine, digits, workers, termination, series_method)
+    
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    calculator.calculate_pi()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    
+    peak = peak_memory()
+    peak_rss_kb = peak // 1024 if peak is not None else None
+    return {"wall_s": wall, "cpu_s": cpu, "iterations": calculator.iterations, "peak_rss_kb": peak_rss_kb}
+
+def run_bench_trial(engine, digits, workers, termination="fixpoint", series_method="taylor", warmup=0):
+    """Run bench_trial in a fresh interpreter and return its measurements"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(bench_trial, engine, digits, workers, termination, series_method, warmup).result()
+
+def predict_wall(points, digits):
+    """Wall time at digits extrapolated from an engine's measured (digits, wall_s) points"""
+    measured_digits, wall = points[-1]
+    exponent = BENCH_DEFAULT_EXPONENT
+    if len(points) > 1:
+        (d0, t0), (d1, t1) = points[-2:]
+        if d1 > d0 and t1 > t0 > 0:
+            exponent = max(1, math.log(t1 / t0) / math.log(d1 / d0))
+    return wall * (digits / measured_digits) ** exponent
+
+def bench_key(result):
+    """Identity of a bench result for baseline comparison; older files predate the sine modes"""
+    return (result["engine"], result.get("termination", "fixpoint"), result.get("series", "taylor"),
+            result["digits"])
+
+def compare_with_baseline(results, baseline, threshold):
+    """Print wall-time ratios against a baseline run, returns the number of regressions"""
+    baseline_walls = {bench_key(r): r["wall_s"] for r in baseline["results"]}
+    regressions = 0
+    print(f"\nComparison with baseline (threshold {threshold:.0%}):")
+    for r in results:
+        before = baseline_walls.get(bench_key(r))
+        if not before:
+            print(f"  {r['engine']:>18} {r['digits']:>10}: not in baseline")
+            continue
+        ratio = r["wall_s"] / before
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        print(f"  {r['engine']:>18} {r['digits']:>10}: {before:.4f}s -> {r['wall_s']:.4f}s "
+              f"({ratio:.2f}x) {verdict}")
+    return regressions
+
+def bench_main(argv):
+    """Entry point of the bench subcommand, returns the process exit code"""
+    parser = argparse.ArgumentParser(prog='Da_CLI_pi_computer.py bench',
+                                     description='Benchmark the π engines over a ladder of digit counts')
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES),
+                        help='Engines to benchmark (default: all)')
+    parser.add_argument('--digits', default='1000,10000,100000',
+                        help='Comma-separated digit counts (default: 1000,10000,100000)')
+    parser.add_argument('--trials', type=int, default=3, help='Measured trials per point (default: 3)')
+    parser.add_argument('--warmup', type=int, default=1, help='Discarded warmup runs before each trial, in the trial\'s process (default: 1)')
+    parser.add_argument('--workers', '-j', type=int, default=1, help='Worker processes per trial (default: 1)')
+    parser.add_argument('--termination', choices=TERMINATIONS, default='fixpoint',
+                        help='Termination of the sine engines (default: fixpoint)')
+    parser.add_argument('--series', choices=SERIES_METHODS, default='taylor',
+                        help='sin(x) series of the sine engines (default: taylor)')
+    parser.add_argument('--max-seconds', type=float, default=60, metavar='SECONDS',
+                        help='Skip larger digit counts for an engine once a trial takes, or its measured '
+                             'scaling predicts it would take, longer (default: 60)')
+    parser.add_argument('--output', '-o', default='bench.json', help='JSON results file (default: bench.json)')
+    parser.add_argument('--baseline', metavar='FILE', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression (default: 0.10)')
+    args = parser.parse_args(argv)
+    
+    try:
+        ladder = sorted(int(d) for d in args.digits.split(','))
+    except ValueError:
+        parser.error("--digits must be a comma-separated list of integers")
+    if not ladder or ladder[0] < 1 or args.trials < 1 or args.warmup < 0 or args.workers < 1:
+        parser.error("digit counts, trials and workers must be positive")
+    
+    results = []
+    print(f"Sine engines: {args.termination} termination, {args.series} series")
+    print(f"{'engine':>18} {'digits':>10} {'wall s':>10} {'cpu s':>10} {'iterations':>10} {'peak RSS MB':>12}")
+    for engine in args.engines:
+        points = []
+        for i, digits in enumerate(ladder):
+            trials = [run_bench_trial(engine, digits, args.workers, args.termination, args.series, args.warmup)
+                      for _ in range(args.trials)]
             
-            while term > limit and self.running:
-                term *= sec_sq / ((count + 1) * (count + 2))
-                acc -= term
-                
-                term *= sec_sq / ((count + 3) * (count + 4))
-                acc += term
-                
-                count += 4
-                iteration += 1
-                
-                # Update progress every 100 iterations
-                if iteration % 100 == 0:
-                    progress = (prec_cur / self.precision) * 100
-                    elapsed = (time.time_ns() - self.start_time) / 1_000_000_000
-                    print(f"Progress: {progress:.1f}% | Elapsed: {self.format_time(elapsed)}", end='\r')
-                    sys.stdout.flush()
+            rss = [t["peak_rss_kb"] for t in trials if t["peak_rss_kb"] is not None]
+            result = {
+                "engine": engine,
+                "termination": args.termination,
+                "series": args.series,
+                "digits": digits,
+                "workers": args.workers,
+                "wall_s": statistics.median(t["wall_s"] for t in trials),
+                "cpu_s": statistics.median(t["cpu_s"] for t in trials),
+                "iterations": trials[0]["iterations"],
+                "peak_rss_kb": max(rss) if rss else None,
+                "trials": trials,
+            }
+            results.append(result)
+            rss_text = f"{result['peak_rss_kb'] / 1024:.1f}" if rss else "-"
+            print(f"{engine:>18} {digits:>10} {result['wall_s']:>10.4f} {result['cpu_s']:>10.4f} "
+                  f"{result['iterations']:>10} {rss_text:>12}")
             
-            if acc in queue_cur:
-                if prec_cur < self.precision:
-                    prec_cur += prec_cur
-                    if prec_cur > self.precision:
-                        prec_cur = self.precision
-                    limit = Decimal(10) ** (-prec_cur - excess_prec)
-                    getcontext().prec = prec_cur + excess_prec
-                else:
-                    second = acc
+            # Each trial runs a point warmup + 1 times, so one predicted to exceed the limit is not started
+            points.append((digits, result["wall_s"]))
+            if i + 1 < len(ladder):
+                predicted = predict_wall(points, ladder[i + 1])
+                if predicted > args.max_seconds:
+                    print(f"{engine:>18} {ladder[i + 1]:>10} skipped: predicted {predicted:.1f}s "
+                          f"exceeds --max-seconds")
                     break
-            
-            qq_append(acc)
-            qq_pop(0)
-            second = acc
-        
-        if self.running:  # Only if not stopped manually
-            getcontext().prec = self.precision
-            self.current_value = +second
-            return self.current_value
-        return None
-    
-    def stop(self):
-        self.running = False
-    
-    def format_time(self, seconds):
-        """Format seconds into HH:MM:SS.ms"""
-        if seconds is None:
-            return "--:--:--.---"
-        
-        # Split into whole seconds and milliseconds
-        whole_seconds = int(seconds)
-        milliseconds = int((seconds - whole_seconds) * 1000)
-        
-        # Format main time part
-        time_str = str(timedelta(seconds=whole_seconds))
-        # Add milliseconds
-        return f"{time_str}.{milliseconds:03d}"
+    
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "gmpy2": gmpy2 is not None,
+        "trials": args.trials,
+        "warmup": args.warmup,
+        "termination": args.termination,
+        "series": args.series,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+    
+    if args.baseline:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading baseline: {str(e)}")
+            return 1
+        if compare_with_baseline(results, baseline, args.threshold):
+            return 1
+    return 0
 
-def save_result(value, filename="pi.txt"):
-    """Save the result to a file"""
+def digits_main(argv):
+    """Entry point of the digits subcommand, returns the process exit code"""
+    parser = argparse.ArgumentParser(prog='Da_CLI_pi_computer.py digits',
+                                     description='Read digits from a file saved with --format packed')
+    parser.add_argument('file', help='Packed digits file')
+    parser.add_argument('--from', dest='start', type=int, default=1, metavar='N',
+                        help='First decimal place to print, counting from 1 (default: 1)')
+    parser.add_argument('--count', type=int, default=100, metavar='K', help='Number of digits to print (default: 100)')
+    parser.add_argument('--export', metavar='FILE', help='Write the whole number to FILE as plain text instead')
+    args = parser.parse_args(argv)
+    
+    if args.start < 1 or args.count < 0:
+        parser.error("--from must be positive and --count must not be negative")
     try:
-        with open(filename, "w") as f:
-            f.write(str(value))
-        print(f"\nResult saved to {filename}")
-    except Exception as e:
-        print(f"\nError saving file: {str(e)}")
+        with PackedDigits(args.file) as packed:
+            if args.export:
+                with open(args.export, "w") as f:
+                    for chunk in packed.text_chunks():
+                        f.write(chunk)
+                print(f"Exported {packed.digits} digits to {args.export}")
+            else:
+                print(packed.read(packed.point + args.start - 1, args.count))
+    except (OSError, ValueError) as e:
+        print(f"Error reading packed digits: {str(e)}")
+        return 1
+    return 0
 
 def main():
-    parser = argparse.ArgumentParser(description='Calculate π to specified precision')
-    parser.add_argument('digits', type=int, help='Number of digits to calculate')
-    parser.add_argument('--output', '-o', default='pi.txt', help='Output file name (default: pi.txt)')
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sys.exit(bench_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "digits":
+        sys.exit(digits_main(sys.argv[2:]))
+    
+    parser = argparse.ArgumentParser(description='Calculate π to specified precision',
+                                     epilog='Benchmarks: %(prog)s bench --help, '
+                                            'reading packed files: %(prog)s digits --help')
+    parser.add_argument('digits', type=int, nargs='?',
+                        help='Number of digits to calculate (taken from the checkpoint with --resume)')
+    parser.add_argument('--output', '-o', help='Output file name (default: pi.txt, or pi.pack with --format packed)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help='Output file format: plain text or 19 digits per 64-bit word with a block index '
+                             '(default: text)')
     parser.add_argument('--no-save', action='store_true', help='Don\'t save the result to a file')
+    parser.add_argument('--engine', choices=ENGINES,
+                        help='Algorithm used to compute π (default: sine-fixpoint, chudnovsky with --serve)')
+    parser.add_argument('--termination', choices=TERMINATIONS, default='fixpoint',
+                        help='Sine engines: repeat each precision until the value stops changing, or stop '
+                             'as soon as the cubic error bound covers it (default: fixpoint)')
+    parser.add_argument('--series', choices=SERIES_METHODS, default='taylor',
+                        help='Sine engines: sum sin(x) term by term, or by rectangular splitting with '
+                             'argument reduction (default: taylor)')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Worker processes for engines that can split their work (default: 1)')
+    parser.add_argument('--compare', choices=ENGINES, metavar='ENGINE',
+                        help='Also run ENGINE and compare its time and digits with --engine')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='Periodically save the calculation state to FILE')
+    parser.add_argument('--checkpoint-interval', type=float, default=60, metavar='SECONDS',
+                        help='Seconds between checkpoints (default: 60)')
+    parser.add_argument('--resume', metavar='FILE',
+                        help='Resume the calculation saved in checkpoint FILE')
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='Serve digits to PREFIX/RANGE requests on ADDRESS, a Unix socket path or '
+                             '[host:]port, computing with --engine when a request exceeds what is stored')
+    parser.add_argument('--hex-at', type=int, metavar='N',
+                        help='Print hex digits of π from hex place N (counting from 1) by BBP digit extraction, '
+                             'without computing the earlier digits')
+    parser.add_argument('--count', type=int, default=BBP_CHUNK_DIGITS, metavar='K',
+                        help=f'Number of hex digits printed with --hex-at (default: {BBP_CHUNK_DIGITS})')
+    parser.add_argument('--spot-check', action='store_true',
+                        help='Check the last hex digits the result determines against BBP digit extraction')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print a per-phase timing table after the calculation')
+    parser.add_argument('--profile-trace', metavar='FILE',
+                        help='Write a Chrome trace JSON timeline of the phases to FILE (implies --profile)')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='Serve results from, and add results to, the digit cache in DIR')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_BYTES / 2**20, metavar='MB',
+                        help='Evict smaller cached results beyond this total size (default: 1024)')
+    parser.add_argument('--max-memory', type=float, metavar='MB',
+                        help='Low-memory mode: keep only minimal engine state and spill finished Chudnovsky '
+                             'blocks to temporary files once they take more than a quarter of MB')
     args = parser.parse_args()
     
-    if args.digits < 1:
+    if args.digits is None and not args.resume and args.hex_at is None and not args.serve:
+        parser.error("the following arguments are required: digits")
+    if args.digits is not None and args.digits < 1:
         print("Error: Number of digits must be positive")
         sys.exit(1)
+    if args.workers < 1:
+        print("Error: Number of workers must be positive")
+        sys.exit(1)
+    if args.max_memory is not None and args.max_memory <= 0:
+        print("Error: Memory limit must be positive")
+        sys.exit(1)
+    if args.engine is None:
+        # Served requests can reach SERVE_MAX_DIGITS, far beyond what the quadratic sine engines finish
+        args.engine = 'chudnovsky' if args.serve else 'sine-fixpoint'
     
     calculator = PiCalculator()
     calculator.precision = args.digits
+    calculator.engine = args.engine
+    calculator.termination = args.termination
+    calculator.series_method = args.series
+    calculator.workers = args.workers
+    calculator.checkpoint_path = args.checkpoint or args.resume
+    calculator.checkpoint_interval = args.checkpoint_interval
+    calculator.cache_dir = args.cache_dir
+    calculator.cache_max_bytes = int(args.cache_max_mb * 2**20)
+    calculator.max_memory = int(args.max_memory * 2**20) if args.max_memory else None
+    profiler = PhaseProfiler() if args.profile or args.profile_trace else None
+    calculator.profile_callback = profiler
+    profile_phase = profiler.phase if profiler else (lambda name: nullcontext())
+    
+    if args.serve:
+        import asyncio
+        from pi_core.server import DigitServer, serve
+        
+        server = DigitServer(args.engine, args.workers, args.cache_dir, calculator.cache_max_bytes)
+        try:
+            asyncio.run(serve(args.serve, server))
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+        except (OSError, ValueError) as e:
+            print(f"Error starting server: {str(e)}")
+            sys.exit(1)
+        finally:
+            server.close()
+        return
+    
+    if args.hex_at is not None:
+        if args.hex_at < 1 or args.count < 1:
+            print("Error: Hex place and count must be positive")
+            sys.exit(1)
+        start = time.time_ns()
+        try:
+            hex_digits = bbp_hex_digits(args.hex_at, args.count, args.workers)
+        except KeyboardInterrupt:
+            print("\nDigit extraction interrupted by user.")
+            return
+        elapsed = (time.time_ns() - start) / 1_000_000_000
+        print(f"Hex digits of π from place {args.hex_at}: {hex_digits}")
+        print(f"Time: {format_time(elapsed)}")
+        return
+    
+    if args.resume:
+        try:
+            calculator.load_checkpoint(args.resume)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError) as e:
+            print(f"Error loading checkpoint: {str(e)}")
+            sys.exit(1)
+        if args.digits is not None and args.digits != calculator.precision:
+            print(f"Error: Checkpoint is for {calculator.precision} digits, not {args.digits}")
+            sys.exit(1)
+        print(f"Resuming {calculator.engine} calculation from {args.resume}")
+    last_update = 0
+    
+    def print_progress(current_value, current_precision, fraction, eta):
+        nonlocal last_update
+        now = time.time_ns()
+        if now - last_update < 100_000_000 and fraction < 1:  # Redraw at most 10 times per second
+            return
+        last_update = now
+        elapsed = (now - calculator.start_time) / 1_000_000_000
+        print(f"Progress: {fraction:.1%} | Elapsed: {format_time(elapsed)} | "
+              f"Remaining: {format_time(eta)}", end='\r')
+        sys.stdout.flush()
     
     try:
-        result = calculator.calculate_pi()
+        print(f"Calculating π to {calculator.precision} digits ({calculator.engine})...")
+        print("Progress: 0%", end='\r')
+        result = calculator.calculate_pi(print_progress)
         if result is None:
             print("\nCalculation stopped.")
+            report_checkpoint(calculator)
             return
         
         elapsed = (time.time_ns() - calculator.start_time) / 1_000_000_000
-        print(f"\nCalculation complete! Time: {calculator.format_time(elapsed)}")
-        print(f"\nπ = {result}")
+        if calculator.served_from_cache:
+            print(f"\nServed from cache in {args.cache_dir}! Time: {format_time(elapsed)}")
+        else:
+            print(f"\nCalculation complete! Time: {format_time(elapsed)}")
+        print("\nπ = ", end="")
+        with profile_phase("to-string"):
+            write_decimal(result, sys.stdout, calculator.precision)
+        print()
         
-        # Verify result if precision <= 10000
-        if calculator.precision <= 10000:
+        with profile_phase("verify"):
             verification = calculator.verify_result(result)
-            if verification is None:
-                print("\nVerification skipped: Da_actual_pi.txt not found")
+        if verification is None:
+            print(f"\nVerification skipped: {REFERENCE_FILE} not found or too short "
+                  f"(--compare ENGINE or --spot-check cross-check without it)")
+        else:
+            is_correct, position = verification
+            if is_correct:
+                print("\n✓ Result verified correct!")
             else:
-                is_correct, position = verification
-                if is_correct:
-                    print("\n✓ Result verified correct!")
+                print(f"\n✗ Error at position {position} (counting from 0)")
+        
+        if args.spot_check:
+            with profile_phase("spot-check"):
+                check = spot_check(result, calculator.precision, calculator.workers)
+            if check is None:
+                print("\nSpot check skipped: too few digits for a hex comparison")
+            else:
+                position, expected, found = check
+                if expected == found:
+                    print(f"\n✓ Hex digits {expected} at place {position} match BBP extraction")
                 else:
-                    print(f"\n✗ Error at position {position} (counting from 0)")
+                    print(f"\n✗ Hex digits at place {position}: {found}, BBP extraction gives {expected}")
+        
+        if args.compare:
+            compare_engines(calculator, result, elapsed, args.compare)
         
         # Save result if requested
         if not args.no_save:
-            save_result(result, args.output)
+            with profile_phase("save"):
+                output = args.output or ("pi.pack" if args.format == "packed" else "pi.txt")
+                save_result(result, calculator.precision, output, args.format)
+        
+        if calculator.max_memory:
+            peak = peak_memory()
+            peak_text = f"{peak / 2**20:.1f} MB" if peak is not None else "not reported on this platform"
+            print(f"\nPeak memory: {peak_text} (limit {args.max_memory:g} MB, "
+                  f"{calculator.spilled_blocks} blocks spilled to disk)")
+        
+        if profiler:
+            profiler.print_table()
+            if args.profile_trace:
+                profiler.write_trace(args.profile_trace)
+                print(f"\nTrace saved to {args.profile_trace}")
             
     except KeyboardInterrupt:
         print("\nCalculation interrupted by user.")
         calculator.stop()
+        calculator.save_checkpoint()
+        report_checkpoint(calculator)
     except Exception as e:
         print(f"\nError during calculation: {str(e)}")
         calculator.stop()
@@ -1,121 +1,288 @@
-from decimal import getcontext, Decimal
+from decimal import localcontext, Decimal
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, filedialog
 import threading
+import signal
+import queue
 import time
-from datetime import datetime, timedelta
+import multiprocessing
 import os
+import pickle
+import mmap
 
-class PiCalculator:
-    def __init__(self):
-        self.running = False
-        self.precision = 100
-        self.current_value = None
-        self.progress_callback = None
-        self.completion_callback = None
-        self.start_time = None
-        
-    def verify_result(self, calculated_pi):
-        """Verify calculated pi against actual pi for precision <= 10000"""
-        if self.precision > 10000:
-            return None
-            
+from pi_core.engine import ENGINES, REFERENCE_FILE, PiCalculator, write_decimal, format_time
+
+CHECKPOINT_FILE = "pi.checkpoint"
+CACHE_DIR = "pi_cache"
+
+# Progress is redrawn at most this often, showing only this many leading digits
+PROGRESS_INTERVAL_MS = 33
+PROGRESS_HEAD_DIGITS = 60
+# Digit viewer layout: lines on screen, digits per line (blocks of 10), width of the offset column
+VIEWER_LINES = 12
+VIEWER_DIGITS_PER_LINE = 50
+VIEWER_OFFSET_WIDTH = 12
+VIEWER_LINE_WIDTH = VIEWER_OFFSET_WIDTH + 2 + VIEWER_DIGITS_PER_LINE + VIEWER_DIGITS_PER_LINE // 10
+# Seconds a stopped worker process gets to write its checkpoint before it and its pool are killed
+STOP_GRACE_SECONDS = 3
+
+def run_calculation_process(settings, conn):
+    """Entry point of the process-backed worker: run PiCalculator and report over conn
+    
+    Progress is sent as a short string head of the current value, so the Tk
+    process never formats or holds full-precision intermediate values.
+    SIGTERM stops the calculation the way Stop does in thread mode, so the
+    final checkpoint is written before the worker exits.
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()  # Own process group, so Stop also kills an engine's worker pool
+    
+    calculator = PiCalculator()
+    for name in ("precision", "engine", "workers", "checkpoint_path", "cache_dir"):
+        setattr(calculator, name, settings[name])
+    signal.signal(signal.SIGTERM, lambda signum, frame: calculator.stop())
+    last_sent = 0
+    
+    def send_progress(current_value, current_precision, fraction, eta):
+        nonlocal last_sent
+        now = time.monotonic()
+        if now - last_sent < PROGRESS_INTERVAL_MS / 1000:
+            return
+        last_sent = now
+        head = None
+        if current_value is not None:
+            with localcontext() as ctx:
+                ctx.prec = PROGRESS_HEAD_DIGITS
+                head = str(+current_value)
+        conn.send(("progress", head, current_precision, fraction, eta))
+    
+    try:
+        if settings["resume_path"]:
+            calculator.load_checkpoint(settings["resume_path"])
+        result = calculator.calculate_pi(send_progress)
+        if result is None:
+            conn.send(("stopped",))
+        else:
+            conn.send(("complete", str(result), calculator.served_from_cache))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+class DigitViewer(ttk.Frame):
+    """Paged view of the digits after the decimal point, grouped in blocks of 10
+    
+    Only the visible lines are ever inserted into the Text widget; the digits
+    stay in a string (in-memory result) or a memory-mapped file, which also
+    serves jump-to-position and search.
+    """
+    
+    def __init__(self, master):
+        super().__init__(master)
+        self.source = ""
+        self.offset = 0  # Index of the first digit after the decimal point in source
+        self.length = 0  # Number of digits after the decimal point
+        self.top_line = 0
+        self.match = None  # (first digit index, length) of the last search hit
+        self.mapped_file = None
+        
+        # Toolbar: jump to a position, search for a digit string, open a saved file
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        ttk.Label(toolbar, text="Go to digit:").grid(row=0, column=0, sticky=tk.W)
+        self.position_var = tk.StringVar()
+        position_entry = ttk.Entry(toolbar, textvariable=self.position_var, width=12)
+        position_entry.grid(row=0, column=1, padx=2)
+        position_entry.bind("<Return>", lambda event: self.jump())
+        ttk.Button(toolbar, text="Go", command=self.jump, width=4).grid(row=0, column=2, padx=2)
+        
+        ttk.Label(toolbar, text="Find:").grid(row=0, column=3, sticky=tk.W, padx=(10, 0))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=12)
+        search_entry.grid(row=0, column=4, padx=2)
+        search_entry.bind("<Return>", lambda event: self.search())
+        ttk.Button(toolbar, text="Next", command=self.search, width=5).grid(row=0, column=5, padx=2)
+        ttk.Button(toolbar, text="Open File...", command=self.open_file).grid(row=0, column=6, padx=(10, 0))
+        
+        self.info_var = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.info_var).grid(row=1, column=0, columnspan=2, sticky=tk.W)
+        
+        self.text = tk.Text(self, width=VIEWER_LINE_WIDTH, height=VIEWER_LINES, wrap=tk.NONE,
+                            font=("TkFixedFont",))
+        self.text.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.text.tag_configure("match", background="yellow")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
+        
+        self.text.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.text.bind("<Button-5>", lambda event: self.scroll(1))
+        self.show_message("")
+    
+    @property
+    def total_lines(self):
+        return (self.length + VIEWER_DIGITS_PER_LINE - 1) // VIEWER_DIGITS_PER_LINE
+    
+    def show_message(self, message):
+        """Replace the digits with a plain message, e.g. progress while computing"""
+        self.close_file()
+        self.source, self.offset, self.length = "", 0, 0
+        self.match = None
+        self.info_var.set("")
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", message)
+        self.text.config(state=tk.DISABLED)
+        self.scrollbar.set(0.0, 1.0)
+    
+    def set_text(self, value_str):
+        """Show a result held in memory as text, e.g. str(Decimal)"""
+        self.show_message("")
+        self.attach(value_str, "in memory")
+    
+    def load_file(self, path):
+        """Show a saved result without reading it into memory"""
+        self.show_message("")
+        with open(path, "rb") as f:
+            self.mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.attach(self.mapped_file, path)
+    
+    def open_file(self):
+        path = filedialog.askopenfilename(title="View digits from file",
+                                          filetypes=[("Text files", "*.txt"), ("All files", "*")])
+        if not path:
+            return
         try:
-            with open("Da_actual_pi.txt", "r") as f:
-                actual_pi = f.read().strip()
-                # Convert actual pi to Decimal and round to same precision
-                actual_decimal = Decimal(actual_pi)
-                getcontext().prec = self.precision
-                actual_rounded = +actual_decimal  # This forces rounding to current precision
-                
-                # For n digits total, we want "3." plus (n-1) digits after decimal
-                comparison_length = self.precision + 1  # +1 for decimal point
-                calculated_str = str(calculated_pi)[:comparison_length]
-                actual_str = str(actual_rounded)[:comparison_length]
-                
-                if calculated_str == actual_str:
-                    return True, None
-                else:
-                    # Find first difference
-                    for i, (c1, c2) in enumerate(zip(calculated_str, actual_str)):
-                        if c1 != c2:
-                            position = i
-                            break
-                    return False, position
-        except FileNotFoundError:
-            return None
-        except Exception as e:
-            return None
-        
-    def calculate_pi(self, progress_callback=None, completion_callback=None):
-        self.running = True
-        self.progress_callback = progress_callback
-        self.completion_callback = completion_callback
-        self.start_time = time.time_ns()  # Use nanosecond precision
-        
-        excess_prec = 2
-        prec_cur = 100 if self.precision > 100 else self.precision
-        getcontext().prec = prec_cur + excess_prec
-        
-        second = Decimal(3)  # Current element for PI
-        queue_cur = [Decimal(0), Decimal(0), Decimal(0), second]
-        
-        qq_append = queue_cur.append
-        qq_pop = queue_cur.pop
-        
-        limit = Decimal(10) ** (-prec_cur - excess_prec)
-        iteration = 0
+            self.load_file(path)
+        except (OSError, ValueError) as e:  # ValueError: empty file cannot be mapped
+            self.show_message(f"Cannot open {path}: {str(e)}")
+    
+    def close_file(self):
+        if self.mapped_file is not None:
+            self.mapped_file.close()
+            self.mapped_file = None
+    
+    def attach(self, source, origin):
+        point = b"." if isinstance(source, mmap.mmap) else "."
+        end = len(source)
+        while end and source[end - 1:end].isspace():
+            end -= 1
+        dot = source.find(point, 0, min(end, 64))
+        
+        self.source = source
+        self.offset = dot + 1 if dot >= 0 else end
+        self.length = end - self.offset
+        self.top_line = 0
+        integer_part = self.decode(source[:max(dot, 0)]) if dot >= 0 else self.decode(source[:end])
+        self.info_var.set(f"π = {integer_part}.…  {self.length:,} digits after the point ({origin})")
+        self.render()
+    
+    def decode(self, chunk):
+        return chunk.decode("ascii") if isinstance(chunk, bytes) else chunk
+    
+    def digits(self, start, stop):
+        """Digits [start, stop) after the decimal point, as text"""
+        return self.decode(self.source[self.offset + start:self.offset + min(stop, self.length)])
+    
+    def render(self):
+        """Draw the visible lines only"""
+        self.top_line = max(0, min(self.top_line, self.total_lines - VIEWER_LINES))
+        lines = []
+        for line in range(self.top_line, min(self.top_line + VIEWER_LINES, self.total_lines)):
+            start = line * VIEWER_DIGITS_PER_LINE
+            chunk = self.digits(start, start + VIEWER_DIGITS_PER_LINE)
+            groups = " ".join(chunk[i:i + 10] for i in range(0, len(chunk), 10))
+            lines.append(f"{start + 1:>{VIEWER_OFFSET_WIDTH}}  {groups}")
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        if self.match:
+            self.highlight(*self.match)
+        self.text.config(state=tk.DISABLED)
+        
+        if self.total_lines:
+            first = self.top_line / self.total_lines
+            last = min(self.top_line + VIEWER_LINES, self.total_lines) / self.total_lines
+            self.scrollbar.set(first, last)
+    
+    def highlight(self, start, length):
+        """Tag the digits [start, start + length) that are on screen"""
+        first_visible = self.top_line * VIEWER_DIGITS_PER_LINE
+        last_visible = first_visible + VIEWER_LINES * VIEWER_DIGITS_PER_LINE
+        for index in range(max(start, first_visible), min(start + length, last_visible)):
+            line = index // VIEWER_DIGITS_PER_LINE - self.top_line + 1
+            column = index % VIEWER_DIGITS_PER_LINE
+            column += column // 10 + VIEWER_OFFSET_WIDTH + 2  # Group spaces and the offset column
+            self.text.tag_add("match", f"{line}.{column}")
+    
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == "moveto":
+            self.top_line = int(float(args[1]) * self.total_lines)
+            self.render()
+        elif args[0] == "scroll":
+            step = int(args[1]) * (VIEWER_LINES if args[2] == "pages" else 1)
+            self.scroll(step)
+    
+    def scroll(self, lines):
+        if self.length:
+            self.top_line += lines
+            self.render()
+    
+    def show_digit(self, index):
+        """Scroll so the digit at index (0 = first after the point) is on the top line"""
+        self.top_line = index // VIEWER_DIGITS_PER_LINE
+        self.render()
+    
+    def jump(self):
+        try:
+            position = int(self.position_var.get())
+        except ValueError:
+            return
+        if self.length and 1 <= position <= self.length:
+            self.show_digit(position - 1)
+    
+    def search(self):
+        """Find the next occurrence of the digit string after the last hit, wrapping around"""
+        needle = self.search_var.get().strip()
+        if not self.length or not needle.isdigit():
+            return
+        if isinstance(self.source, mmap.mmap):
+            needle = needle.encode("ascii")
+        
+        start = self.match[0] + 1 if self.match else 0
+        end = self.offset + self.length
+        found = self.source.find(needle, self.offset + start, end)
+        if found < 0 and start:
+            found = self.source.find(needle, self.offset, end)
+        if found < 0:
+            self.match = None
+            self.info_var.set(f"{self.search_var.get()} not found")
+            self.render()
+            return
         
-        while self.running:
-            sec_sq = second * second
-            term = second
-            acc = second + term
-            count = Decimal(1)
-            
-            while term > limit and self.running:
-                term *= sec_sq / ((count + 1) * (count + 2))
-                acc -= term
-                
-                term *= sec_sq / ((count + 3) * (count + 4))
-                acc += term
-                
-                count += 4
-                
-                iteration += 1
-                if iteration % 10 == 0 and self.progress_callback:
-                    self.progress_callback(acc, prec_cur)
-            
-            if acc in queue_cur:
-                if prec_cur < self.precision:
-                    prec_cur += prec_cur
-                    if prec_cur > self.precision:
-                        prec_cur = self.precision
-                    limit = Decimal(10) ** (-prec_cur - excess_prec)
-                    getcontext().prec = prec_cur + excess_prec
-                else:
-                    second = acc
-                    break
-            
-            qq_append(acc)
-            qq_pop(0)
-            second = acc
-        
-        if self.running:  # Only if not stopped manually
-            getcontext().prec = self.precision
-            self.current_value = +second
-            if self.completion_callback:
-                self.completion_callback(self.current_value)
-    
-    def stop(self):
-        self.running = False
+        self.match = (found - self.offset, len(needle))
+        self.info_var.set(f"{self.search_var.get()} found at digit {found - self.offset + 1:,}")
+        self.show_digit(found - self.offset)
 
 class PiCalculatorGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("π Calculator")
         self.calculator = PiCalculator()
+        self.calculator.cache_dir = CACHE_DIR
         self.calc_thread = None
+        self.calc_process = None
+        self.calc_conn = None
+        self.stop_deadline = None  # Set while a stopped worker process is writing its checkpoint
+        self.launch_time = 0
         self.timer_id = None
+        # Worker thread -> Tk main loop; drained by poll_events
+        self.events = queue.Queue()
+        self.last_progress_put = 0
+        self.eta = None
+        self.eta_time = 0
         
         # Create main frame
         main_frame = ttk.Frame(root, padding="10")
@@ -134,9 +301,31 @@ class PiCalculatorGUI:
         self.stop_button = ttk.Button(main_frame, text="Stop", command=self.stop_calculation, state=tk.DISABLED)
         self.stop_button.grid(row=0, column=3, padx=5)
         
+        self.resume_button = ttk.Button(main_frame, text="Resume", command=self.resume_calculation)
+        self.resume_button.grid(row=0, column=4, padx=5)
+        
+        # Engine selection
+        ttk.Label(main_frame, text="Engine:").grid(row=1, column=0, sticky=tk.W)
+        self.engine_var = tk.StringVar(value=ENGINES[0])
+        self.engine_combo = ttk.Combobox(main_frame, textvariable=self.engine_var, values=ENGINES,
+                                         state="readonly", width=15)
+        self.engine_combo.grid(row=1, column=1, sticky=tk.W, padx=5)
+        
+        # Worker processes
+        ttk.Label(main_frame, text="Workers:").grid(row=1, column=2, sticky=tk.E)
+        self.workers_var = tk.StringVar(value="1")
+        workers_spin = ttk.Spinbox(main_frame, from_=1, to=os.cpu_count() or 1,
+                                   textvariable=self.workers_var, width=5)
+        workers_spin.grid(row=1, column=3, sticky=tk.W, padx=5)
+        
+        # Process-backed worker: no GIL contention with Tk and Stop returns immediately
+        self.process_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(main_frame, text="Separate process",
+                        variable=self.process_var).grid(row=1, column=4, sticky=tk.W)
+        
         # Timer display
         timer_frame = ttk.LabelFrame(main_frame, text="Time", padding="5")
-        timer_frame.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        timer_frame.grid(row=2, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=5)
         
         # Elapsed time
         ttk.Label(timer_frame, text="Elapsed:").grid(row=0, column=0, sticky=tk.W)
@@ -151,14 +340,14 @@ class PiCalculatorGUI:
         # Progress bar
         self.progress_var = tk.DoubleVar()
         self.progress = ttk.Progressbar(main_frame, length=300, mode='determinate', variable=self.progress_var)
-        self.progress.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=10)
+        self.progress.grid(row=3, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=10)
         
         # Result display
         result_frame = ttk.LabelFrame(main_frame, text="Results", padding="5")
-        result_frame.grid(row=3, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        result_frame.grid(row=4, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=5)
         
-        self.result_text = scrolledtext.ScrolledText(result_frame, width=50, height=10, wrap=tk.WORD)
-        self.result_text.grid(row=0, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        self.viewer = DigitViewer(result_frame)
+        self.viewer.grid(row=0, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
         
         # Verification result
         self.verify_var = tk.StringVar(value="")
@@ -168,29 +357,18 @@ class PiCalculatorGUI:
         # Status label
         self.status_var = tk.StringVar(value="Ready")
         self.status_label = ttk.Label(main_frame, textvariable=self.status_var)
-        self.status_label.grid(row=4, column=0, columnspan=4, sticky=tk.W)
+        self.status_label.grid(row=5, column=0, columnspan=5, sticky=tk.W)
         
         # Save button
         self.save_button = ttk.Button(main_frame, text="Save to File", command=self.save_result, state=tk.DISABLED)
-        self.save_button.grid(row=5, column=0, columnspan=4, pady=5)
+        self.save_button.grid(row=6, column=0, columnspan=5, pady=5)
         
         # Configure grid
         for child in main_frame.winfo_children():
             child.grid_configure(padx=5, pady=5)
-    
-    def format_time(self, seconds):
-        """Format seconds into HH:MM:SS.ms"""
-        if seconds is None:
-            return "--:--:--.---"
         
-        # Split into whole seconds and milliseconds
-        whole_seconds = int(seconds)
-        milliseconds = int((seconds - whole_seconds) * 1000)
-        
-        # Format main time part
-        time_str = str(timedelta(seconds=whole_seconds))
-        # Add milliseconds
-        return f"{time_str}.{milliseconds:02d}"
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.poll_events()
     
     def update_timer(self):
         """Update the timer display"""
@@ -202,37 +380,136 @@ class PiCalculatorGUI:
         
         if self.calculator.start_time:
             elapsed = (time.time_ns() - self.calculator.start_time) / 1_000_000_000
-            self.elapsed_var.set(self.format_time(elapsed))
+            self.elapsed_var.set(format_time(elapsed))
             
-            # Calculate estimated time remaining
-            progress = self.progress_var.get()
-            if progress > 0:
-                total_estimated = elapsed / (progress / 100)
-                remaining = total_estimated - elapsed
-                self.remaining_var.set(self.format_time(remaining))
+            # Count down from the engine's last estimate between progress reports
+            if self.eta is not None:
+                remaining = max(self.eta - (time.monotonic() - self.eta_time), 0)
+                self.remaining_var.set(format_time(remaining))
         
         # Schedule next update only if still running
         if self.calculator.running:
             self.timer_id = self.root.after(50, self.update_timer)  # Update every 50ms for smoother display
     
-    def update_progress(self, current_value, current_precision):
-        if not self.calculator.running:
+    def report_progress(self, current_value, current_precision, fraction, eta):
+        """Progress callback on the worker thread: queue at most one update per refresh"""
+        now = time.monotonic()
+        if now - self.last_progress_put < PROGRESS_INTERVAL_MS / 1000:
             return
+        self.last_progress_put = now
+        self.events.put(("progress", current_value, current_precision, fraction, eta))
+    
+    def report_complete(self, final_value):
+        """Completion callback on the worker thread"""
+        self.events.put(("complete", final_value))
+    
+    def poll_events(self):
+        """Apply queued worker events on the Tk thread, coalescing progress to the newest"""
+        latest_progress = None
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == "progress":
+                    latest_progress = event
+                elif event[0] == "complete":
+                    latest_progress = None
+                    self.calculation_complete(event[1])
+        except queue.Empty:
+            pass
+        
+        try:
+            while self.calc_conn and self.calc_conn.poll():
+                message = self.calc_conn.recv()
+                if message[0] == "progress":
+                    latest_progress = message
+                elif message[0] == "complete":
+                    latest_progress = None
+                    self.process_complete(message[1], message[2])
+                elif message[0] == "error":
+                    latest_progress = None
+                    self.process_failed(message[1])
+                elif message[0] == "stopped":  # Checkpoint written, only the pool may be left
+                    self.close_process(kill=True)
+                    self.show_stopped()
+        except (EOFError, OSError):
+            if self.stop_deadline is not None:  # Exited before it could report
+                self.close_process(kill=True)
+                self.show_stopped()
+            else:
+                self.process_failed("worker process exited unexpectedly")
         
-        # Update progress bar
-        progress = (current_precision / self.calculator.precision) * 100
-        self.progress_var.set(progress)
+        if self.stop_deadline is not None and time.monotonic() > self.stop_deadline:
+            self.close_process(kill=True)
+            self.show_stopped()
         
-        # Update result display
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"Current Value:\n{current_value}\n\n")
-        self.result_text.insert(tk.END, f"Current Precision: {current_precision} digits")
+        if latest_progress:
+            self.update_progress(*latest_progress[1:])
+        self.root.after(PROGRESS_INTERVAL_MS, self.poll_events)
+    
+    def process_complete(self, result_str, served_from_cache):
+        """Take over the result sent by the worker process"""
+        self.close_process()
+        self.calculator.current_value = Decimal(result_str)
+        self.calculator.served_from_cache = served_from_cache
+        self.calculation_complete(self.calculator.current_value)
+    
+    def process_failed(self, message):
+        self.close_process()
+        self.calculator.running = False
+        self.status_var.set(f"Error during calculation: {message}")
+        self.start_button.config(state=tk.NORMAL)
+        self.resume_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+    
+    def request_process_stop(self):
+        """Ask the worker process to stop and checkpoint, it is killed at stop_deadline"""
+        self.stop_deadline = time.monotonic() + STOP_GRACE_SECONDS
+        try:
+            os.kill(self.calc_process.pid, signal.SIGTERM)
+        except OSError:
+            pass  # Already gone; poll_events sees the closed pipe
+    
+    def close_process(self, kill=False):
+        """Drop the worker process and its pipe, killing it (and its pool) if asked"""
+        self.stop_deadline = None
+        if self.calc_process and kill:
+            # The group outlives a worker that already exited while its pool processes finish
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(self.calc_process.pid, signal.SIGKILL)
+                else:
+                    self.calc_process.kill()
+            except OSError:
+                # No process group: the child is still importing and has started no pool, or all are gone
+                self.calc_process.kill()
+            self.calc_process.join(timeout=1.0)  # Reap it; a killed process exits at once
+        if self.calc_conn:
+            self.calc_conn.close()
+        self.calc_process = None
+        self.calc_conn = None
+    
+    def update_progress(self, current_value, current_precision, fraction, eta):
+        if not self.calculator.running:
+            return
+        
+        # Update progress bar and the estimate update_timer counts down from
+        self.progress_var.set(fraction * 100)
+        self.eta = eta
+        self.eta_time = time.monotonic()
+        
+        # Update result display; rounding to a short head keeps this cheap at any precision
+        message = ""
+        if isinstance(current_value, str):  # Already rounded by the worker process
+            message = f"Current Value:\n{current_value}…\n\n"
+        elif current_value is not None:
+            with localcontext() as ctx:
+                ctx.prec = PROGRESS_HEAD_DIGITS
+                head = +current_value
+            message = f"Current Value:\n{head}…\n\n"
+        self.viewer.show_message(message + f"Current Precision: {current_precision} digits")
         
         # Update status
         self.status_var.set(f"Computing... ({current_precision}/{self.calculator.precision} digits)")
-        
-        # Force update
-        self.root.update_idletasks()
     
     def calculation_complete(self, final_value):
         # Stop the timer first
@@ -242,33 +519,32 @@ class PiCalculatorGUI:
             self.timer_id = None
         
         self.progress_var.set(100)
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"Final Value of π:\n{final_value}")
-        
-        # Verify result if precision <= 10000
-        if self.calculator.precision <= 10000:
-            verification = self.calculator.verify_result(final_value)
-            if verification is None:
-                self.verify_var.set("Verification skipped: Da_actual_pi.txt not found")
-                self.verify_label.configure(foreground="gray")
-            else:
-                is_correct, position = verification
-                if is_correct:
-                    self.verify_var.set("✓ Result verified correct!")
-                    self.verify_label.configure(foreground="green")
-                else:
-                    self.verify_var.set(f"✗ Error at position {position} (counting from 0)")
-                    self.verify_label.configure(foreground="red")
+        self.viewer.set_text(str(final_value))
+        
+        verification = self.calculator.verify_result(final_value)
+        if verification is None:
+            self.verify_var.set(f"Verification skipped: {REFERENCE_FILE} not found or too short")
+            self.verify_label.configure(foreground="gray")
         else:
-            self.verify_var.set("")
+            is_correct, position = verification
+            if is_correct:
+                self.verify_var.set("✓ Result verified correct!")
+                self.verify_label.configure(foreground="green")
+            else:
+                self.verify_var.set(f"✗ Error at position {position} (counting from 0)")
+                self.verify_label.configure(foreground="red")
         
         # Show final time
         elapsed = (time.time_ns() - self.calculator.start_time) / 1_000_000_000
-        self.elapsed_var.set(self.format_time(elapsed))
+        self.elapsed_var.set(format_time(elapsed))
         self.remaining_var.set("00:00:00")
-        self.status_var.set(f"Calculation complete! Total time: {self.format_time(elapsed)}")
+        if self.calculator.served_from_cache:
+            self.status_var.set(f"Served from cache ({CACHE_DIR})! Total time: {format_time(elapsed)}")
+        else:
+            self.status_var.set(f"Calculation complete! Total time: {format_time(elapsed)}")
         
         self.start_button.config(state=tk.NORMAL)
+        self.resume_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.save_button.config(state=tk.NORMAL)
     
@@ -277,32 +553,103 @@ class PiCalculatorGUI:
             precision = int(self.precision_var.get())
             if precision < 1:
                 raise ValueError("Precision must be positive")
+            workers = int(self.workers_var.get())
+            if workers < 1:
+                raise ValueError("Workers must be positive")
         except ValueError as e:
             self.status_var.set(f"Error: {str(e)}")
             return
         
         self.calculator.precision = precision
+        self.calculator.engine = self.engine_var.get()
+        self.calculator.workers = workers
+        self.calculator.checkpoint_path = CHECKPOINT_FILE
+        self.calculator.resume_state = None
+        self.launch_calculation()
+    
+    def resume_calculation(self):
+        path = filedialog.askopenfilename(
+            title="Resume from checkpoint",
+            initialfile=CHECKPOINT_FILE,
+            filetypes=[("Checkpoints", "*.checkpoint"), ("All files", "*")]
+        )
+        if not path:
+            return
+        
+        try:
+            workers = int(self.workers_var.get())
+            if workers < 1:
+                raise ValueError("Workers must be positive")
+            # A worker process loads the engine state itself, so only the settings are read here
+            self.calculator.load_checkpoint(path, load_state=not self.process_var.get())
+        except (OSError, EOFError, ValueError, KeyError, pickle.UnpicklingError) as e:
+            self.status_var.set(f"Error loading checkpoint: {str(e)}")
+            return
+        
+        self.calculator.workers = workers
+        self.calculator.checkpoint_path = path
+        self.precision_var.set(str(self.calculator.precision))
+        self.engine_var.set(self.calculator.engine)
+        self.launch_calculation(resume_path=path)
+    
+    def launch_calculation(self, resume_path=None):
+        """Reset the displays and run the configured calculator on a worker thread or process"""
+        self.launch_time = time.time()
         self.start_button.config(state=tk.DISABLED)
+        self.resume_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         self.save_button.config(state=tk.DISABLED)
         self.status_var.set("Starting calculation...")
         self.progress_var.set(0)
+        self.eta = None
         
         # Reset displays
         self.elapsed_var.set("00:00:00")
         self.remaining_var.set("--:--:--")
         self.verify_var.set("")
         
-        self.calc_thread = threading.Thread(
-            target=self.calculator.calculate_pi,
-            args=(self.update_progress, self.calculation_complete)
-        )
-        self.calc_thread.daemon = True
-        self.calc_thread.start()
+        if self.process_var.get():
+            self.launch_process(resume_path)
+        else:
+            self.calc_thread = threading.Thread(
+                target=self.calculator.calculate_pi,
+                args=(self.report_progress, self.report_complete)
+            )
+            self.calc_thread.daemon = True
+            self.calc_thread.start()
         
         # Start timer updates
         self.update_timer()
     
+    def launch_process(self, resume_path=None):
+        """Run the calculation in a spawned process that reports through a pipe
+        
+        The process is not a daemon, since daemons cannot start the engines'
+        worker pools; close_window and main() make sure it does not outlive
+        the GUI.
+        """
+        calculator = self.calculator
+        settings = {
+            "precision": calculator.precision,
+            "engine": calculator.engine,
+            "workers": calculator.workers,
+            "checkpoint_path": calculator.checkpoint_path,
+            "cache_dir": calculator.cache_dir,
+            "resume_path": resume_path,
+        }
+        
+        context = multiprocessing.get_context("spawn")
+        self.calc_conn, child_conn = context.Pipe(duplex=False)
+        self.calc_process = context.Process(target=run_calculation_process, args=(settings, child_conn))
+        self.calc_process.start()
+        child_conn.close()
+        
+        # The local calculator only mirrors the run's state for the timer and the result
+        calculator.running = True
+        calculator.start_time = time.time_ns() - (calculator.resume_elapsed_ns if settings["resume_path"] else 0)
+        calculator.resume_state = None
+        calculator.resume_elapsed_ns = 0
+    
     def stop_calculation(self):
         # Disable stop button immediately to prevent multiple clicks
         self.stop_button.config(state=tk.DISABLED)
@@ -317,25 +664,49 @@ class PiCalculatorGUI:
         if self.calculator:
             self.calculator.stop()
         
+        # A worker process writes its checkpoint and exits; poll_events finishes the stop
+        if self.calc_process:
+            self.request_process_stop()
+            return
+        
         # Handle thread cleanup in a safe way
         if self.calc_thread and self.calc_thread.is_alive():
             try:
                 self.calc_thread.join(timeout=1.0)  # Wait up to 1 second for thread to finish
             except Exception:
                 pass  # Ignore any thread-related errors
-        
-        # Update UI state
+        self.show_stopped()
+    
+    def show_stopped(self):
+        """Re-enable the controls and report the stopped run and its checkpoint"""
         self.start_button.config(state=tk.NORMAL)
+        self.resume_button.config(state=tk.NORMAL)
         self.remaining_var.set("--:--:--")
         
         # Show final elapsed time
         if self.calculator.start_time:
             elapsed = (time.time_ns() - self.calculator.start_time) / 1_000_000_000
-            self.elapsed_var.set(self.format_time(elapsed))
-            self.status_var.set(f"Calculation stopped. Elapsed time: {self.format_time(elapsed)}")
+            self.elapsed_var.set(format_time(elapsed))
+            status = f"Calculation stopped. Elapsed time: {format_time(elapsed)}"
+            # Only a checkpoint this run wrote, not one left by an earlier run
+            path = self.calculator.checkpoint_path
+            if os.path.exists(path) and os.path.getmtime(path) >= self.launch_time:
+                status += f" (checkpoint: {path})"
+            self.status_var.set(status)
         else:
             self.status_var.set("Calculation stopped.")
     
+    def close_window(self):
+        """Stop a running calculation, giving a worker process time to checkpoint, and close"""
+        self.calculator.stop()
+        if self.calc_process:
+            self.request_process_stop()
+            self.calc_process.join(timeout=STOP_GRACE_SECONDS)
+        elif self.calc_thread and self.calc_thread.is_alive():
+            self.calc_thread.join(timeout=1.0)
+        self.close_process(kill=True)
+        self.root.destroy()
+    
     def save_result(self):
         if not self.calculator.current_value:
             self.status_var.set("No result to save")
@@ -343,7 +714,7 @@ class PiCalculatorGUI:
         
         try:
             with open("pi.txt", "w") as f:
-                f.write(str(self.calculator.current_value))
+                write_decimal(self.calculator.current_value, f, self.calculator.precision)
             self.status_var.set("Result saved to pi.txt")
         except Exception as e:
             self.status_var.set(f"Error saving file: {str(e)}")
@@ -351,7 +722,10 @@ class PiCalculatorGUI:
 def main():
     root = tk.Tk()
     app = PiCalculatorGUI(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.close_process(kill=True)  # The worker is no daemon, it must not outlive the GUI
 
 if __name__ == "__main__":
     main()
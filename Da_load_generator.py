@@ -0,0 +1,98 @@
+import asyncio
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from pi_core.server import parse_address
+
+async def open_connection(address):
+    kind, where = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(where)
+    return await asyncio.open_connection(*where)
+
+async def request(reader, writer, line):
+    """Send one request line and return the payload, raising RuntimeError on an ERR reply"""
+    writer.write(line.encode("ascii") + b"\n")
+    await writer.drain()
+    status = (await reader.readline()).decode("ascii").split(maxsplit=1)
+    if not status or status[0] != "OK":
+        raise RuntimeError(status[1].strip() if len(status) > 1 else "connection closed")
+    payload = await reader.readexactly(int(status[1]) + 1)
+    return payload[:-1]
+
+def make_request(rng, max_digits, range_fraction):
+    """A random PREFIX or RANGE request line within max_digits"""
+    if rng.random() < range_fraction:
+        start = rng.randrange(max_digits)
+        return f"RANGE {start} {rng.randint(start + 1, min(start + 1000, max_digits))}"
+    return f"PREFIX {rng.randint(1, max_digits)}"
+
+async def client(address, requests, max_digits, range_fraction, seed, latencies, errors):
+    """One connection issuing requests back to back"""
+    rng = random.Random(seed)
+    reader, writer = await open_connection(address)
+    try:
+        for _ in range(requests):
+            line = make_request(rng, max_digits, range_fraction)
+            start = time.perf_counter()
+            try:
+                await request(reader, writer, line)
+                latencies.append(time.perf_counter() - start)
+            except RuntimeError as e:
+                errors.append(f"{line}: {e}")
+    finally:
+        writer.close()
+
+async def run(args):
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.connect, args.requests, args.max_digits, args.range_fraction,
+                                  args.seed + i, latencies, errors) for i in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(latencies)} requests ok, {len(errors)} failed in {elapsed:.3f}s "
+          f"({len(latencies) / elapsed:.1f} requests/s)")
+    if latencies:
+        latencies.sort()
+
+        def percentile(q):
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+        print(f"latency ms: mean {statistics.mean(latencies) * 1000:.3f}, p50 {percentile(0.5):.3f}, "
+              f"p95 {percentile(0.95):.3f}, p99 {percentile(0.99):.3f}, max {latencies[-1] * 1000:.3f}")
+    for error in errors[:5]:
+        print(f"error: {error}")
+
+    reader, writer = await open_connection(args.connect)
+    try:
+        print(f"server: {(await request(reader, writer, 'STATS')).decode('ascii')}")
+    finally:
+        writer.close()
+    return 1 if errors else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure throughput and latency of a π digit server '
+                                                 '(Da_CLI_pi_computer.py --serve ADDRESS)')
+    parser.add_argument('connect', metavar='ADDRESS', help='Unix socket path or [host:]port of the server')
+    parser.add_argument('--clients', '-c', type=int, default=8, help='Concurrent connections (default: 8)')
+    parser.add_argument('--requests', '-n', type=int, default=100, help='Requests per connection (default: 100)')
+    parser.add_argument('--max-digits', type=int, default=10000,
+                        help='Largest prefix or range end requested (default: 10000)')
+    parser.add_argument('--range-fraction', type=float, default=0.5,
+                        help='Share of RANGE requests, the rest are PREFIX (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the first connection (default: 0)')
+    args = parser.parse_args()
+
+    if args.clients < 1 or args.requests < 1 or args.max_digits < 1:
+        parser.error("clients, requests and max digits must be positive")
+    try:
+        sys.exit(asyncio.run(run(args)))
+    except (OSError, ValueError) as e:
+        print(f"Error connecting to {args.connect}: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
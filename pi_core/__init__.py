@@ -0,0 +1,81 @@
+"""π engines, verification and digit output shared by the CLI and the GUI
+
+    >>> import pi_core
+    >>> pi_core.compute(30, engine="chudnovsky")
+    Decimal('3.14159265358979323846264338328')
+
+Importing the package is cheap: the engines and gmpy2 (when installed) load
+on first use of one of the names below, process pools only for runs with
+more than one worker, and asyncio only with the digit server.
+"""
+import importlib
+
+# Public name -> submodule that defines it, imported on first access
+_EXPORTS = {
+    "ENGINES": "engine",
+    "TERMINATIONS": "engine",
+    "SERIES_METHODS": "engine",
+    "REFERENCE_FILE": "engine",
+    "DEFAULT_CACHE_MAX_BYTES": "engine",
+    "PiCalculator": "engine",
+    "DigitCache": "engine",
+    "ProgressModel": "engine",
+    "decimal_chunks": "engine",
+    "write_decimal": "engine",
+    "format_time": "engine",
+    "peak_memory": "engine",
+    "OUTPUT_FORMATS": "packed",
+    "PackedDigits": "packed",
+    "write_packed": "packed",
+    "bbp_hex_digits": "bbp",
+    "spot_check": "bbp",
+    "DigitServer": "server",
+    "serve": "server",
+}
+
+__all__ = ["compute", *_EXPORTS]
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+def compute(digits, engine="chudnovsky", on_progress=None, *, workers=1, termination="fixpoint",
+            series_method="taylor", cache_dir=None, cache_max_bytes=None, max_memory=None):
+    """π to digits significant digits as a Decimal, computed in the calling thread
+    
+    on_progress, if given, is called as on_progress(value, digits, fraction,
+    eta) while the engine runs; value is None for engines without a running
+    approximation. With cache_dir, results are looked up in and stored to a
+    digit cache there. max_memory, in bytes, selects the low-memory mode of
+    PiCalculator. The caller's decimal context is left unchanged.
+    """
+    from decimal import localcontext
+    from .engine import PiCalculator, ENGINES, TERMINATIONS, SERIES_METHODS, DEFAULT_CACHE_MAX_BYTES
+    
+    if digits < 1:
+        raise ValueError("digits must be positive")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if termination not in TERMINATIONS:
+        raise ValueError(f"Unknown termination: {termination}")
+    if series_method not in SERIES_METHODS:
+        raise ValueError(f"Unknown series method: {series_method}")
+    
+    calculator = PiCalculator()
+    calculator.precision = digits
+    calculator.engine = engine
+    calculator.termination = termination
+    calculator.series_method = series_method
+    calculator.workers = workers
+    calculator.cache_dir = cache_dir
+    calculator.cache_max_bytes = DEFAULT_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+    calculator.max_memory = max_memory
+    with localcontext():
+        return calculator.calculate_pi(on_progress)
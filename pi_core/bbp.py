@@ -0,0 +1,78 @@
+from decimal import localcontext, Decimal, ROUND_DOWN
+
+from .engine import exact_context
+
+# BBP digit extraction: hex digits per evaluation, and bits beyond them that absorb the truncation
+# of every term. Computed results are spot-checked this many decimal digits short of their end.
+BBP_CHUNK_DIGITS = 16
+BBP_GUARD_BITS = 32
+LOG10_16 = 1.2041199826559248
+SPOT_CHECK_DIGITS = 8
+SPOT_CHECK_MARGIN_DIGITS = 5
+
+def bbp_fraction(n, bits):
+    """Fractional part of 16**n * π as a bits-bit fixed-point number
+    
+    Each sum of the Bailey–Borwein–Plouffe formula is split at k = n: the
+    head terms only need 16**(n-k) modulo 8k+j, the tail terms shrink by
+    16 per step, so no earlier digit is ever computed.
+    """
+    s1 = s4 = s5 = s6 = 0
+    for k in range(n + 1):
+        e = n - k
+        d = 8 * k
+        s1 += (pow(16, e, d + 1) << bits) // (d + 1)
+        s4 += (pow(16, e, d + 4) << bits) // (d + 4)
+        s5 += (pow(16, e, d + 5) << bits) // (d + 5)
+        s6 += (pow(16, e, d + 6) << bits) // (d + 6)
+    
+    k = n + 1
+    shift = bits - 4
+    while shift > 0:
+        d = 8 * k
+        s1 += (1 << shift) // (d + 1)
+        s4 += (1 << shift) // (d + 4)
+        s5 += (1 << shift) // (d + 5)
+        s6 += (1 << shift) // (d + 6)
+        k += 1
+        shift -= 4
+    return (4 * s1 - 2 * s4 - s5 - s6) & ((1 << bits) - 1)
+
+def bbp_hex_chunk(position, count):
+    """count hex digits of π starting at hex place position, counting from 1"""
+    n = position - 1
+    bits = 4 * count + BBP_GUARD_BITS + n.bit_length()
+    return f"{bbp_fraction(n, bits) >> (bits - 4 * count):0{count}X}"
+
+def bbp_hex_digits(position, count, workers=1):
+    """Hex digits of π from hex place position, spread over a process pool in chunks"""
+    starts = list(range(position, position + count, BBP_CHUNK_DIGITS))
+    sizes = [min(BBP_CHUNK_DIGITS, position + count - start) for start in starts]
+    if workers > 1 and len(starts) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            return "".join(pool.map(bbp_hex_chunk, starts, sizes))
+    return "".join(map(bbp_hex_chunk, starts, sizes))
+
+def decimal_hex_digits(value, digits, position, count):
+    """Hex digits of a computed value from hex place position, None past what its digits determine"""
+    if (position + count - 1) * LOG10_16 > digits - 1 - SPOT_CHECK_MARGIN_DIGITS:
+        return None
+    with localcontext(exact_context()):
+        scaled = (value * Decimal(16) ** (position + count - 1)).to_integral_value(rounding=ROUND_DOWN)
+        return f"{int(scaled % 16 ** count):0{count}X}"
+
+def spot_check(value, digits, workers=1):
+    """Compare the last hex digits a result determines with BBP extraction
+    
+    Returns None if the result is too short to hold SPOT_CHECK_DIGITS hex
+    digits, otherwise (position, expected, found).
+    """
+    position = int((digits - 1 - SPOT_CHECK_MARGIN_DIGITS) / LOG10_16) - SPOT_CHECK_DIGITS + 1
+    if position < 1:
+        return None
+    found = decimal_hex_digits(value, digits, position, SPOT_CHECK_DIGITS)
+    expected = bbp_hex_digits(position, SPOT_CHECK_DIGITS, workers)
+    return position, expected, found
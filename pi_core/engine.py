@@ -0,0 +1,1320 @@
+from decimal import getcontext, localcontext, Decimal, Context, MAX_PREC, MAX_EMAX, MIN_EMIN, ROUND_DOWN
+from datetime import timedelta
+import time
+import math
+import os
+import sys
+import pickle
+import mmap
+import shutil
+import tempfile
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, peak memory is then not reported
+    resource = None
+
+try:
+    import gmpy2
+    mpz = gmpy2.mpz
+except ImportError:  # gmpy2 is optional, plain ints work everywhere
+    gmpy2 = None
+    mpz = int
+
+ENGINES = ("sine-fixpoint", "sine-fixpoint-int", "chudnovsky", "agm")
+TERMINATIONS = ("fixpoint", "bound")
+SERIES_METHODS = ("taylor", "rectangular")
+
+# Fixed-point engine works in binary: bits per decimal digit plus guard bits for truncation
+LOG2_10 = 3.321928094887362
+FIXPOINT_GUARD_BITS = 64
+
+# Error-bound termination: x + sin(x) turns an error e into at most e**3 / 6, and 3 is within
+# 10**-0.849 of π. Steps run at their target precision plus guard digits against rounding.
+LOG10_6 = 0.7781512503836436
+FIXPOINT_START_DIGITS = 0.849
+FIXPOINT_GUARD_DIGITS = 20
+FIXPOINT_TARGET_EXTRA_DIGITS = 10
+
+# Chudnovsky series constants: each term adds ~14.18 correct digits
+CHUDNOVSKY_DIGITS_PER_TERM = 14.181647462725477
+CHUDNOVSKY_C3_OVER_24 = 640320 ** 3 // 24
+CHUDNOVSKY_LEAF_TERMS = 16
+CHUDNOVSKY_SERIAL_BLOCKS = 32  # Single-process runs still split in blocks so they can be checkpointed
+
+CHECKPOINT_VERSION = 2
+
+# Progress model: a multiplication costs precision**exponent until measured rates refit the exponent;
+# the sine engines are planned with these passes per precision level
+DECIMAL_COST_EXPONENT = 1.2
+INT_COST_EXPONENT = 1.585 if gmpy2 is None else 1.2
+PROGRESS_FIT_MIN_SECONDS = 0.05
+PROGRESS_MAX_FRACTION = 0.99
+FIXPOINT_FIRST_LEVEL_PASSES = 8
+FIXPOINT_LEVEL_PASSES = 4
+CHUDNOVSKY_MERGE_MULTIPLICATIONS = 5
+CHUDNOVSKY_FINAL_MULTIPLICATIONS = 10
+AGM_STEP_MULTIPLICATIONS = 9
+
+# Output: ints below this size convert directly, text is produced and written in chunks of this many digits
+INT_TO_DECIMAL_CUTOFF_BITS = 8192
+OUTPUT_CHUNK_DIGITS = 1 << 16
+POWERS_OF_TWO = {}
+
+# Verification reads the reference in blocks of this many bytes
+REFERENCE_FILE = "Da_actual_pi.txt"
+VERIFY_BLOCK_SIZE = 1 << 20
+VERIFY_TIE_DIGITS = 64
+
+# Digit cache: intermediate entries are evicted above this size, digits read past the cut to round
+DEFAULT_CACHE_MAX_BYTES = 1 << 30
+CACHE_ROUNDING_DIGITS = 20
+
+# Low-memory mode: finished Chudnovsky blocks are spilled to disk once those held in memory pass
+# this share of max_memory, the rest of the budget is left to the merge in flight. libmpdec
+# stores coefficients in 8-byte words of 19 digits.
+LOW_MEMORY_HELD_FRACTION = 0.25
+DECIMAL_DIGITS_PER_WORD = 19
+SPILL_SUFFIX = ".spill"
+
+def exact_context():
+    """Decimal context in which integer arithmetic never rounds"""
+    return Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+def chudnovsky_leaf(a, b):
+    """P, Q, T of the Chudnovsky terms [a, b) using machine-sized Python ints"""
+    if b - a == 1:
+        if a == 0:
+            p_ab = q_ab = 1
+        else:
+            p_ab = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q_ab = a * a * a * CHUDNOVSKY_C3_OVER_24
+        t_ab = p_ab * (13591409 + 545140134 * a)
+        if a & 1:
+            t_ab = -t_ab
+        return p_ab, q_ab, t_ab
+
+    m = (a + b) // 2
+    p1, q1, t1 = chudnovsky_leaf(a, m)
+    p2, q2, t2 = chudnovsky_leaf(m, b)
+    return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+def chudnovsky_merge(left, right, need_p=True):
+    """Combine the P, Q, T of two adjacent term ranges exactly, P is None unless need_p"""
+    p1, q1, t1 = left
+    p2, q2, t2 = right
+    with localcontext(exact_context()):
+        return p1 * p2 if need_p else None, q1 * q2, q2 * t1 + p1 * t2
+
+def chudnovsky_level_cost(nodes):
+    """Full-precision multiplications of a binary splitting level with nodes merges of equal size"""
+    return CHUDNOVSKY_MERGE_MULTIPLICATIONS * nodes ** (1 - DECIMAL_COST_EXPONENT)
+
+def block_bytes(block):
+    """Approximate memory of the exact Decimals of a P, Q, T block"""
+    return sum(8 * (x.adjusted() // DECIMAL_DIGITS_PER_WORD + 1) for x in block if x is not None)
+
+def peak_memory():
+    """Peak resident memory of this process in bytes, None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Kilobytes except on macOS
+
+class SpilledBlock:
+    """A P, Q, T block pickled to a file; only its path stays in memory and in checkpoints"""
+    
+    def __init__(self, path, block):
+        self.path = path
+        with open(path, "wb") as f:
+            pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def load(self):
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+def chudnovsky_block(a, b):
+    """P, Q, T of the terms [a, b) as exact Decimals; runs inside worker processes"""
+    if b - a <= CHUDNOVSKY_LEAF_TERMS:
+        return tuple(Decimal(x) for x in chudnovsky_leaf(a, b))
+    m = (a + b) // 2
+    return chudnovsky_merge(chudnovsky_block(a, m), chudnovsky_block(m, b))
+
+def bound_digits(known, correction_digits, prec):
+    """Correct digits after an x + sin(x) step from a value correct to known digits
+    
+    The step's correction is sin(x), which is the error of x to first order,
+    so its measured size caps the assumed input accuracy and a value worse
+    than predicted can never be taken as converged.
+    """
+    return min(3 * min(known, correction_digits - 0.01) + LOG10_6, prec)
+
+def bound_precision(known, target):
+    """Digits one x + sin(x) step can add to a value correct to known digits, at most target"""
+    return min(target, max(int(3 * known + LOG10_6), 1))
+
+def sine_terms(log2_y, bits):
+    """Terms of the sin series at |y| = 2**log2_y before they drop below 2**-bits"""
+    def log2_term(k):
+        return (2 * k + 1) * log2_y - math.lgamma(2 * k + 2) / math.log(2)
+    low, high = 0, 1
+    while log2_term(high) > -bits:
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if log2_term(middle) > -bits:
+            low = middle
+        else:
+            high = middle
+    return high
+
+def sine_series_plan(bits):
+    """Choose (reductions, baby steps, terms) for fixpoint_sin and decimal_sin at bits of precision
+    
+    Each reduction divides the argument by 3 and costs two full
+    multiplications to undo, each baby step and each giant step one; the
+    plan with the fewest full multiplications wins.
+    """
+    best = None
+    for reductions in range(1, int(2 * bits ** (1 / 3)) + 2):
+        terms = sine_terms(math.log2(math.pi) - reductions * math.log2(3), bits)
+        baby = max(1, math.isqrt(terms))
+        cost = baby + -(-terms // baby) + 2 * reductions
+        if best is None or cost < best[0]:
+            best = (cost, reductions, baby, terms)
+    return best[1:]
+
+def sine_guard_bits(reductions, terms):
+    """Bits lost to rounding in fixpoint_sin: each triple-angle step can triple the error"""
+    return int(reductions * math.log2(3)) + 2 * terms.bit_length() + 16
+
+def fixpoint_sin(x, bits):
+    """sin(x) for x stored as x * 2**bits, by rectangular splitting
+    
+    The argument is divided by 3**r and the series in z = y**2 is summed
+    in blocks of m terms: inside a block only the precomputed powers
+    z**0 .. z**(m-1) and divisions by small integers are needed, and the
+    blocks are combined by Horner's rule in z**m, one full multiplication
+    each. sin(3y) = 3 sin(y) - 4 sin(y)**3 then undoes the reduction.
+    """
+    reductions, baby, terms = sine_series_plan(bits)
+    guard = sine_guard_bits(reductions, terms)
+    wbits = bits + guard
+    one = mpz(1) << wbits
+    y = (x << guard) // 3 ** reductions
+    z = (y * y) >> wbits
+    powers = [one, z]
+    for _ in range(baby - 1):
+        powers.append((powers[-1] * z) >> wbits)
+    
+    # sin(y) / y = sum of (-1)**k z**k / (2k+1)!, terms k = j*baby + i grouped in blocks j
+    blocks = -(-terms // baby)
+    acc = 0
+    for j in range(blocks - 1, -1, -1):
+        k0 = j * baby
+        inner = powers[baby - 1]
+        for i in range(baby - 2, -1, -1):
+            k = k0 + i + 1
+            inner = powers[i] - inner // ((2 * k) * (2 * k + 1))
+        if acc:
+            divisor = 1
+            for k in range(k0 + 1, k0 + baby + 1):
+                divisor *= (2 * k) * (2 * k + 1)
+            step = ((acc * powers[baby]) >> wbits) // divisor
+            acc = inner - step if baby % 2 else inner + step
+        else:
+            acc = inner
+    
+    s = (y * acc) >> wbits
+    for _ in range(reductions):
+        s = (s * (3 * one - 4 * ((s * s) >> wbits))) >> wbits
+    return s >> guard
+
+def decimal_sin(x, prec):
+    """sin(x) to prec digits, by the same rectangular splitting as fixpoint_sin"""
+    reductions, baby, terms = sine_series_plan(int(prec * LOG2_10))
+    with localcontext() as ctx:
+        ctx.prec = prec + int(sine_guard_bits(reductions, terms) / LOG2_10) + 1
+        y = x / 3 ** reductions
+        z = y * y
+        powers = [Decimal(1), z]
+        for _ in range(baby - 1):
+            powers.append(powers[-1] * z)
+        
+        blocks = -(-terms // baby)
+        acc = None
+        for j in range(blocks - 1, -1, -1):
+            k0 = j * baby
+            inner = powers[baby - 1]
+            for i in range(baby - 2, -1, -1):
+                k = k0 + i + 1
+                inner = powers[i] - inner / ((2 * k) * (2 * k + 1))
+            if acc is not None:
+                divisor = 1
+                for k in range(k0 + 1, k0 + baby + 1):
+                    divisor *= (2 * k) * (2 * k + 1)
+                step = acc * powers[baby] / divisor
+                acc = inner - step if baby % 2 else inner + step
+            else:
+                acc = inner
+        
+        s = y * acc
+        for _ in range(reductions):
+            s = s * (3 - 4 * s * s)
+    return s
+
+def sine_pass_cost(prec, series_method):
+    """Full-precision multiplications of one sin evaluation at prec digits"""
+    bits = int(prec * LOG2_10)
+    if series_method == "rectangular":
+        reductions, baby, terms = sine_series_plan(bits)
+        return baby + -(-terms // baby) + 2 * reductions
+    return sine_terms(math.log2(math.pi), bits)
+
+def decimal_sqrt(n, prec, guess=None, guess_digits=0):
+    """Square root of n to prec digits by Newton iteration with precision doubling
+    
+    Newton runs on 1/sqrt(n), which needs only multiplications, and a guess
+    correct to guess_digits digits replaces the levels of the schedule it
+    already covers.
+    """
+    schedule = []
+    while prec > max(30, guess_digits):
+        schedule.append(prec)
+        prec = prec // 2 + 2
+
+    with localcontext() as ctx:
+        ctx.prec = prec
+        n = Decimal(n)
+        x = +guess if guess is not None and guess_digits >= prec else n.sqrt()
+        if not schedule:
+            return x
+        y = 1 / x
+        for prec_cur in reversed(schedule):
+            ctx.prec = prec_cur
+            residual = 1 - n * y * y
+            ctx.prec = prec_cur // 2 + 2  # The residual is tiny, so the correction needs half the digits
+            correction = y * residual / 2
+            ctx.prec = prec_cur
+            y += correction
+        return n * y
+
+def decimal_reciprocal(d, prec):
+    """1/d to prec digits by Newton iteration with precision doubling
+    
+    Like decimal_sqrt it needs only multiplications, which at high
+    precision is both faster than libmpdec's division and holds far fewer
+    full-size temporaries. d is rounded to each step's precision, so an
+    exact integer of any size only costs its leading digits.
+    """
+    schedule = []
+    while prec > 30:
+        schedule.append(prec)
+        prec = prec // 2 + 2
+    
+    with localcontext() as ctx:
+        ctx.prec = prec
+        y = 1 / +d
+        for prec_cur in reversed(schedule):
+            ctx.prec = prec_cur
+            residual = 1 - +d * y
+            ctx.prec = prec_cur // 2 + 2  # The residual is tiny, so the correction needs half the digits
+            correction = y * residual
+            ctx.prec = prec_cur
+            y += correction
+        return y
+
+def power_of_two(k):
+    """2**k as an exact Decimal, cached because conversions reuse the same split points"""
+    power = POWERS_OF_TWO.get(k)
+    if power is None:
+        with localcontext(exact_context()):
+            power = POWERS_OF_TWO[k] = Decimal(2) ** k
+    return power
+
+def int_to_decimal(n):
+    """Convert a big int to Decimal in subquadratic time
+    
+    Decimal(int) is quadratic in the number of digits. Splitting n at a
+    power-of-two bit position costs only a shift, and the halves are joined
+    again with libmpdec's fast multiplication.
+    """
+    bits = n.bit_length()
+    if bits <= INT_TO_DECIMAL_CUTOFF_BITS:
+        return Decimal(int(n))
+    k = 1 << ((bits - 1).bit_length() - 1)
+    with localcontext(exact_context()):
+        return int_to_decimal(n >> k) * power_of_two(k) + int_to_decimal(n & ((1 << k) - 1))
+
+def coefficient_chunks(coefficient, n_digits, chunk_digits):
+    """Yield the n_digits decimal digits of an integral Decimal, most significant first
+    
+    Pieces are split top-down at multiples of chunk_digits, so only the
+    chunk being written is ever converted to text.
+    """
+    stack = [(coefficient, n_digits)]
+    with localcontext(exact_context()):
+        while stack:
+            piece, digits = stack.pop()
+            if digits <= chunk_digits:
+                yield str(piece).zfill(digits)
+                continue
+            low_digits = ((digits // 2 + chunk_digits - 1) // chunk_digits) * chunk_digits
+            high = piece.scaleb(-low_digits).to_integral_value(rounding=ROUND_DOWN)
+            low = piece - high.scaleb(low_digits)
+            del piece
+            stack.append((low, low_digits))
+            stack.append((high, digits - low_digits))
+
+def decimal_chunks(value, digits, chunk_digits=OUTPUT_CHUNK_DIGITS):
+    """Yield the text of a value with digits significant digits in pieces, as str() would print it"""
+    adjusted = value.adjusted()
+    if not value.is_finite() or adjusted < -6 or digits <= adjusted:
+        yield str(value)  # Scientific notation: only for values that are not π results
+        return
+    
+    with localcontext(exact_context()):
+        coefficient = abs(value).scaleb(digits - 1 - adjusted).to_integral_value()
+    if value.is_signed():
+        yield "-"
+    if adjusted < 0:
+        yield "0." + "0" * (-adjusted - 1)
+        yield from coefficient_chunks(coefficient, digits, chunk_digits)
+        return
+    
+    point = adjusted + 1  # Digits still to come before the decimal point
+    for chunk in coefficient_chunks(coefficient, digits, chunk_digits):
+        if 0 < point < len(chunk):
+            chunk = chunk[:point] + "." + chunk[point:]
+            point = 0
+        elif 0 < point:
+            point -= len(chunk)
+            if point == 0 and digits > adjusted + 1:
+                chunk += "."
+        yield chunk
+
+def write_decimal(value, f, digits):
+    """Stream a value with digits significant digits to a text file"""
+    for chunk in decimal_chunks(value, digits):
+        f.write(chunk)
+
+def first_difference(a, b):
+    """Index of the first differing byte of two equal-length, unequal byte strings"""
+    lo, hi = 0, len(a)
+    while hi - lo > 1:  # Halve with C-speed slice comparisons instead of a byte loop
+        mid = (lo + hi) // 2
+        if a[lo:mid] != b[lo:mid]:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+def round_up(digits, cut, end):
+    """Whether rounding the ASCII digits[:cut] half-even away from digits[cut:end] goes up"""
+    first = digits[cut:cut + 1]
+    if first != b"5":
+        return first > b"5"
+    rest = digits[cut + 1:min(end, cut + 1 + VERIFY_TIE_DIGITS)]
+    if rest.strip(b"0"):
+        return True
+    return int(digits[cut - 1:cut]) % 2 == 1  # A tie rounds to the even digit
+
+class ProgressModel:
+    """Share of the work done and time left, from a cost curve over precision
+    
+    The plan lists (precision, units) pairs, units being full-precision
+    multiplications at that precision, each weighted by
+    precision**exponent. Calibration happens online: the mean ratio of
+    actual to planned units over the finished levels scales the plan of the
+    levels still ahead, the exponent is refitted from the measured rates of
+    the two highest levels, and seconds per weighted unit give the time
+    left. The reported fraction never goes backwards.
+    """
+    
+    def __init__(self, plan, exponent):
+        self.plan = {}
+        for precision, units in plan:
+            self.plan[precision] = self.plan.get(precision, 0) + units
+        self.exponent = exponent
+        self.scale = max(self.plan, default=1)
+        self.done = {}  # precision -> units finished
+        self.seconds = {}  # precision -> seconds spent
+        self.current = None
+        self.last_time = time.monotonic()
+        self.reported = 0.0
+    
+    def weight(self, precision):
+        return (precision / self.scale) ** self.exponent
+    
+    def advance(self, precision, units):
+        """Record units of work finished at precision since the previous call"""
+        now = time.monotonic()
+        self.done[precision] = self.done.get(precision, 0) + units
+        self.seconds[precision] = self.seconds.get(precision, 0) + now - self.last_time
+        self.last_time = now
+        self.current = precision
+        
+        measured = sorted(p for p in self.done if self.seconds[p] >= PROGRESS_FIT_MIN_SECONDS)
+        if len(measured) >= 2:
+            low, high = measured[-2], measured[-1]
+            rate_low = self.seconds[low] / self.done[low]
+            rate_high = self.seconds[high] / self.done[high]
+            if rate_low > 0 and rate_high > 0:
+                exponent = math.log(rate_high / rate_low) / math.log(high / low)
+                self.exponent = min(max(exponent, 1.0), 2.0)
+    
+    def estimate(self):
+        """(fraction done, seconds left); the fraction stays below 1 until the engine finishes"""
+        if not self.done:
+            return 0.0, None
+        finished = [p for p in self.done if p != self.current]
+        done_finished = sum(self.done[p] * self.weight(p) for p in finished)
+        # Per level, so the many passes of one cheap level do not inflate the expensive ones
+        ratios = [self.done[p] / self.plan[p] for p in finished if self.plan.get(p, 0) > 0]
+        ratio = sum(ratios) / len(ratios) if ratios else 1.0
+        
+        done = done_finished + self.done[self.current] * self.weight(self.current)
+        total = done_finished + max(self.done[self.current], self.plan.get(self.current, 0) * ratio) * self.weight(self.current)
+        total += sum(units * ratio * self.weight(p) for p, units in self.plan.items() if p not in self.done)
+        total = max(total, done / PROGRESS_MAX_FRACTION)
+        if done <= 0:
+            return 0.0, None
+        self.reported = max(self.reported, done / total)
+        eta = (total - done) * sum(self.seconds.values()) / done
+        return self.reported, eta
+
+class DigitCache:
+    """On-disk store of computed π values, one text file per precision
+    
+    Any precision up to the largest stored one is answered by rounding a
+    prefix of that file. Smaller entries are only intermediate results and
+    are evicted, least recently used first, once the store exceeds max_bytes.
+    """
+    
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+    
+    def entries(self):
+        """(digits, path) of every stored value, smallest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        
+        entries = []
+        for name in names:
+            if name.startswith("pi_") and name.endswith(".txt") and name[3:-4].isdigit():
+                entries.append((int(name[3:-4]), os.path.join(self.directory, name)))
+        return sorted(entries)
+    
+    def largest(self):
+        """Number of digits of the biggest stored value, 0 if the cache is empty"""
+        entries = self.entries()
+        return entries[-1][0] if entries else 0
+    
+    def lookup(self, digits):
+        """π rounded to digits significant digits, or None if not enough digits are stored"""
+        for stored, path in self.entries():
+            if stored < digits:
+                continue
+            
+            # A few digits past the cut are enough to round; the stored value is itself
+            # rounded, so a tail of exactly 5000... could round the wrong way; a larger
+            # entry may still settle it
+            with open(path, "r") as f:
+                text = f.read(digits + 1 + CACHE_ROUNDING_DIGITS)
+            tail = text[digits + 1:]
+            if tail[:1] == "5" and not tail[1:].strip("0") and len(text) - 1 == stored:
+                continue
+            
+            os.utime(path)  # Mark as recently used for eviction
+            with localcontext() as ctx:
+                ctx.prec = digits
+                return +Decimal(text)
+        return None
+    
+    def store(self, value, digits):
+        """Add a computed value and evict intermediate entries over the size bound"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"pi_{digits}.txt")
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            write_decimal(value, f, digits)
+        os.replace(temp_path, path)
+        self.evict()
+    
+    def evict(self):
+        """Delete least recently used entries, never the largest, until under max_bytes"""
+        entries = self.entries()
+        if len(entries) < 2:
+            return
+        
+        sizes = {path: os.path.getsize(path) for _, path in entries}
+        total = sum(sizes.values())
+        intermediate = sorted((path for _, path in entries[:-1]), key=os.path.getmtime)
+        for path in intermediate:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= sizes[path]
+
+class PiCalculator:
+    def __init__(self):
+        self.running = False
+        self.precision = 100
+        self.engine = "sine-fixpoint"
+        self.termination = "fixpoint"  # Sine engines: repeat until unchanged, or stop on the error bound
+        self.series_method = "taylor"  # Sine engines: term by term, or rectangular splitting
+        self.workers = 1
+        self.current_value = None
+        self.progress_callback = None
+        self.completion_callback = None
+        self.start_time = None
+        self.iterations = 0
+        # Checkpointing: engines hand their state to checkpoint(), which writes it out periodically
+        self.checkpoint_path = None
+        self.checkpoint_interval = 60  # seconds
+        self.checkpoint_state = None
+        self.last_checkpoint = 0
+        self.resume_state = None
+        self.resume_elapsed_ns = 0
+        # Digit cache: any precision up to the largest stored result is served without computing
+        self.cache_dir = None
+        self.cache_max_bytes = DEFAULT_CACHE_MAX_BYTES
+        self.served_from_cache = False
+        # Profiling: profile_callback receives one dict per finished phase
+        self.profile_callback = None
+        # Progress: engines report finished work to progress_model, which estimates fraction and ETA
+        self.progress_model = None
+        # Low-memory mode: with max_memory in bytes, engines keep only the state they need and
+        # finished Chudnovsky blocks over budget are spilled to files in spill_dir
+        self.max_memory = None
+        self.spill_dir = None
+        self.spilled_blocks = 0
+        
+    def verify_result(self, calculated_pi, reference_path=REFERENCE_FILE, digits=None):
+        """Verify calculated pi against a reference file with at least as many digits
+        
+        The reference is memory-mapped and the result converted to text block
+        by block, so either can be any size. digits is the number of digits of
+        calculated_pi, the calculator's precision by default. Returns None if
+        the reference is missing or too short, (True, None) if every digit
+        matches, or (False, position) with the first wrong character counted
+        from 0.
+        """
+        digits = digits or self.precision
+        length = digits + 1 if digits > 1 else digits  # Digits and the decimal point
+        
+        try:
+            with open(reference_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as reference:
+                end = len(reference)
+                while end and reference[end - 1:end].isspace():
+                    end -= 1
+                if end < length:
+                    return None
+                
+                # The calculated value is rounded at its last digit. Rounding up the
+                # reference changes the last non-9 digit and turns the 9s after it to 0s.
+                expected_tail = b""
+                tail_start = length
+                if end > length and round_up(reference, length, end):
+                    tail_start = length - 1
+                    while tail_start > 0 and reference[tail_start:tail_start + 1] in b"9.":
+                        tail_start -= 1
+                    tail = reference[tail_start:length]
+                    expected_tail = (str(int(tail[:1]) + 1).encode()
+                                     + tail[1:].replace(b"9", b"0"))
+                
+                start = 0
+                for chunk in decimal_chunks(calculated_pi, digits, VERIFY_BLOCK_SIZE):
+                    ours = chunk.encode("ascii")
+                    stop = start + len(ours)
+                    theirs = reference[start:min(stop, tail_start)]
+                    if stop > tail_start:
+                        theirs += expected_tail[max(start - tail_start, 0):stop - tail_start]
+                    if ours != theirs:
+                        if len(ours) != len(theirs):  # The result is longer than expected
+                            return False, start + len(theirs)
+                        return False, start + first_difference(ours, theirs)
+                    start = stop
+                if start != length:
+                    return False, start
+                return True, None
+        except (FileNotFoundError, ValueError):  # ValueError: empty file cannot be mapped
+            return None
+    
+    def report_progress(self, value, digits, precision, units):
+        """Count units of work at precision and pass value, digits, fraction done and ETA to the callback"""
+        self.progress_model.advance(precision, units)
+        if self.progress_callback:
+            fraction, eta = self.progress_model.estimate()
+            self.progress_callback(value, digits, fraction, eta)
+    
+    def sine_progress_plan(self):
+        """(precision, multiplications) per precision level of the sine engines"""
+        target = self.precision + FIXPOINT_TARGET_EXTRA_DIGITS
+        levels = []
+        if self.termination == "bound":
+            known = FIXPOINT_START_DIGITS
+            while known < target:
+                prec = bound_precision(known, target)
+                known = min(3 * known + LOG10_6, prec)
+                levels.append((prec, 1))
+        else:
+            prec = min(100, self.precision)
+            levels.append((prec, FIXPOINT_FIRST_LEVEL_PASSES))
+            while prec < self.precision:
+                prec = min(2 * prec, self.precision)
+                levels.append((prec, FIXPOINT_LEVEL_PASSES))
+        return [(prec, passes * sine_pass_cost(prec, self.series_method)) for prec, passes in levels]
+    
+    def profile_event(self, phase, start_ns, level=None, iteration=None, terms=None):
+        """Report a phase that began at start_ns (perf_counter_ns) to profile_callback"""
+        if self.profile_callback:
+            self.profile_callback({
+                "phase": phase,
+                "level": level,
+                "iteration": iteration,
+                "terms": terms,
+                "start_ns": start_ns,
+                "elapsed_ns": time.perf_counter_ns() - start_ns,
+            })
+    
+    def checkpoint(self, state):
+        """Record the engine state and write it out once per checkpoint interval"""
+        if not self.checkpoint_path:
+            return  # Nothing to write, and holding the state would keep superseded values alive
+        self.checkpoint_state = state
+        if time.monotonic() - self.last_checkpoint >= self.checkpoint_interval:
+            self.save_checkpoint()
+    
+    def save_checkpoint(self):
+        """Write the last recorded engine state to checkpoint_path, returns True if written"""
+        if not self.checkpoint_path or self.checkpoint_state is None:
+            return False
+        
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "engine": self.engine,
+            "termination": self.termination,
+            "series_method": self.series_method,
+            "precision": self.precision,
+            "elapsed_ns": time.time_ns() - self.start_time,
+        }
+        # Write next to the target and rename so a crash never leaves a torn checkpoint. The state
+        # is pickled after the header so the settings can be read without loading it.
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(self.checkpoint_state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.checkpoint_path)
+        self.last_checkpoint = time.monotonic()
+        return True
+    
+    def load_checkpoint(self, path, load_state=True):
+        """Restore engine, precision and state so the next calculate_pi resumes from path
+        
+        With load_state False only the settings are read, for a caller that
+        hands the checkpoint on to another process; resume_state stays None.
+        """
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if header.get("version") != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version: {header.get('version')}")
+            if header["engine"] not in ENGINES:
+                raise ValueError(f"Unknown engine in checkpoint: {header['engine']}")
+            
+            self.engine = header["engine"]
+            self.termination = header["termination"]
+            self.series_method = header["series_method"]
+            self.precision = header["precision"]
+            self.resume_elapsed_ns = header["elapsed_ns"]
+            self.resume_state = pickle.load(f) if load_state else None
+        
+    def calculate_pi(self, progress_callback=None, completion_callback=None):
+        self.running = True
+        self.progress_callback = progress_callback
+        self.completion_callback = completion_callback
+        self.start_time = time.time_ns()
+        self.checkpoint_state = None
+        self.last_checkpoint = time.monotonic()
+        if self.resume_state is not None:
+            self.start_time -= self.resume_elapsed_ns
+        
+        self.served_from_cache = False
+        self.spilled_blocks = 0
+        cache = DigitCache(self.cache_dir, self.cache_max_bytes) if self.cache_dir else None
+        if cache and self.resume_state is None:
+            phase_start = time.perf_counter_ns()
+            cached = cache.lookup(self.precision)
+            self.profile_event("cache-lookup", phase_start, self.precision)
+            if cached is not None:
+                self.served_from_cache = True
+                self.current_value = cached
+                if self.completion_callback:
+                    self.completion_callback(self.current_value)
+                return self.current_value
+        
+        try:
+            if self.engine == "chudnovsky":
+                value = self.calculate_chudnovsky()
+            elif self.engine == "sine-fixpoint-int":
+                value = self.calculate_sine_fixpoint_int()
+            elif self.engine == "agm":
+                value = self.calculate_agm()
+            elif self.engine == "sine-fixpoint":
+                value = self.calculate_sine_fixpoint()
+            else:
+                raise ValueError(f"Unknown engine: {self.engine}")
+        finally:
+            if not self.checkpoint_path:  # Also on Ctrl-C or errors: nothing could resume from the spill
+                self.remove_spilled()
+        self.resume_state = None
+        self.resume_elapsed_ns = 0
+        if self.running:
+            self.remove_spilled()
+        
+        if self.running:  # Only if not stopped manually
+            phase_start = time.perf_counter_ns()
+            getcontext().prec = self.precision
+            self.current_value = +value
+            self.profile_event("finalize", phase_start, self.precision)
+            if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            if cache:
+                phase_start = time.perf_counter_ns()
+                cache.store(self.current_value, self.precision)
+                self.profile_event("cache-store", phase_start, self.precision)
+            if self.progress_callback:
+                self.progress_callback(self.current_value, self.precision, 1.0, 0.0)
+            if self.completion_callback:
+                self.completion_callback(self.current_value)
+            return self.current_value
+        
+        self.save_checkpoint()
+        return None
+    
+    def calculate_sine_fixpoint(self):
+        """Iterate x -> x + sin(x) from 3, doubling the working precision as it converges
+        
+        With termination "bound" each step instead runs at the precision the
+        cubic error bound says it can reach, and the result is final once the
+        bound covers the requested digits, without a confirming repeat.
+        """
+        bound = self.termination == "bound"
+        excess_prec = FIXPOINT_GUARD_DIGITS if bound else 2
+        target = self.precision + FIXPOINT_TARGET_EXTRA_DIGITS
+        state = self.resume_state
+        if state:
+            prec_cur = state["prec_cur"]
+            second = state["second"]
+            queue_cur = list(state["queue_cur"])
+            iteration = state["iteration"]
+            series = state["series"]
+            known = state.get("known")
+        else:
+            prec_cur = 100 if self.precision > 100 else self.precision
+            second = Decimal(3)  # Current element for PI
+            queue_cur = [Decimal(0), Decimal(0), Decimal(0), second]
+            iteration = 0
+            series = None
+            known = FIXPOINT_START_DIGITS
+            if bound:
+                prec_cur = bound_precision(known, target)
+        getcontext().prec = prec_cur + excess_prec
+        self.progress_model = ProgressModel(self.sine_progress_plan(), DECIMAL_COST_EXPONENT)
+        
+        # Low-memory mode remembers earlier iterates by hash instead of keeping them
+        key = hash if self.max_memory else (lambda value: value)
+        queue_cur = [key(x) for x in queue_cur]
+        qq_append = queue_cur.append
+        qq_pop = queue_cur.pop
+        
+        limit = Decimal(10) ** (-prec_cur - excess_prec)
+        
+        while self.running:
+            series_start = time.perf_counter_ns()
+            series_iteration = iteration
+            if series:  # Resuming in the middle of a Taylor series
+                term, acc, count = series
+                series = None
+                sec_sq = second * second
+            elif self.series_method == "rectangular":
+                term = Decimal(0)  # Summed in one go, nothing left for the term loop
+                acc = second + decimal_sin(second, getcontext().prec)
+                iteration += 1
+                self.report_progress(acc, min(prec_cur, self.precision), prec_cur,
+                                     sine_pass_cost(prec_cur, self.series_method))
+            else:
+                term = second
+                acc = second + term
+                count = Decimal(1)
+                sec_sq = second * second
+            
+            while term > limit and self.running:
+                term *= sec_sq / ((count + 1) * (count + 2))
+                acc -= term
+                
+                term *= sec_sq / ((count + 3) * (count + 4))
+                acc += term
+                
+                count += 4
+                
+                iteration += 1
+                if iteration % 10 == 0:
+                    self.report_progress(acc, min(prec_cur, self.precision), prec_cur, 20)
+                    self.checkpoint({"prec_cur": prec_cur, "second": second, "queue_cur": list(queue_cur),
+                                     "iteration": iteration, "series": (term, acc, count), "known": known})
+            if not self.running:
+                break
+            self.profile_event("series", series_start, prec_cur, iteration, 2 * (iteration - series_iteration))
+            
+            if bound:
+                check_start = time.perf_counter_ns()
+                correction = abs(acc - second)
+                with localcontext() as ctx:
+                    ctx.prec = 20
+                    correction_digits = -float((+correction).log10()) if correction else float("inf")
+                known = bound_digits(known, correction_digits, prec_cur)
+                self.profile_event("check", check_start, prec_cur, iteration)
+                second = acc
+                if known >= target:
+                    break
+                prec_cur = bound_precision(known, target)
+                limit = Decimal(10) ** (-prec_cur - excess_prec)
+                getcontext().prec = prec_cur + excess_prec
+                self.checkpoint({"prec_cur": prec_cur, "second": second, "queue_cur": list(queue_cur),
+                                 "iteration": iteration, "series": None, "known": known})
+                continue
+            
+            check_start = time.perf_counter_ns()
+            converged = key(acc) in queue_cur
+            self.profile_event("check", check_start, prec_cur, iteration)
+            if converged:
+                if prec_cur < self.precision:
+                    prec_cur += prec_cur
+                    if prec_cur > self.precision:
+                        prec_cur = self.precision
+                    limit = Decimal(10) ** (-prec_cur - excess_prec)
+                    getcontext().prec = prec_cur + excess_prec
+                else:
+                    second = acc
+                    break
+            
+            qq_append(key(acc))
+            qq_pop(0)
+            second = acc
+            self.checkpoint({"prec_cur": prec_cur, "second": second, "queue_cur": list(queue_cur),
+                             "iteration": iteration, "series": None})
+        
+        self.iterations = iteration
+        return second
+    
+    def calculate_sine_fixpoint_int(self):
+        """Same iteration as calculate_sine_fixpoint on binary scaled integers
+        
+        Values are stored as x * 2**bits, so dividing a term by the small
+        factorial factors is a cheap single-limb division instead of a
+        full-precision Decimal division.
+        """
+        bound = self.termination == "bound"
+        target = self.precision + FIXPOINT_TARGET_EXTRA_DIGITS
+        state = self.resume_state
+        if state:
+            prec_cur = state["prec_cur"]
+            bits = state["bits"]
+            second = mpz(state["second"])
+            queue_cur = [mpz(x) for x in state["queue_cur"]]
+            iteration = state["iteration"]
+            series = state["series"]
+            known = state.get("known")
+        else:
+            prec_cur = 100 if self.precision > 100 else self.precision
+            known = FIXPOINT_START_DIGITS
+            if bound:
+                prec_cur = bound_precision(known, target)
+            bits = int(prec_cur * LOG2_10) + FIXPOINT_GUARD_BITS
+            second = mpz(3) << bits  # Current element for PI
+            queue_cur = [mpz(0), mpz(0), mpz(0), second]
+            iteration = 0
+            series = None
+        
+        self.progress_model = ProgressModel(self.sine_progress_plan(), INT_COST_EXPONENT)
+        
+        # Low-memory mode remembers earlier iterates by hash instead of keeping them
+        key = hash if self.max_memory else (lambda value: value)
+        queue_cur = [key(x) for x in queue_cur]
+        qq_append = queue_cur.append
+        qq_pop = queue_cur.pop
+        
+        while self.running:
+            series_start = time.perf_counter_ns()
+            series_iteration = iteration
+            if series:  # Resuming in the middle of a Taylor series
+                term, acc, count = mpz(series[0]), mpz(series[1]), series[2]
+                series = None
+                sec_sq = (second * second) >> bits
+            elif self.series_method == "rectangular":
+                term = 0  # Summed in one go, nothing left for the term loop
+                acc = second + fixpoint_sin(second, bits)
+                iteration += 1
+                self.report_progress(None, min(prec_cur, self.precision), prec_cur,
+                                     sine_pass_cost(prec_cur, self.series_method))
+            else:
+                term = second
+                acc = second + term
+                count = 1
+                sec_sq = (second * second) >> bits
+            
+            while term and self.running:
+                term = ((term * sec_sq) >> bits) // ((count + 1) * (count + 2))
+                acc -= term
+                
+                term = ((term * sec_sq) >> bits) // ((count + 3) * (count + 4))
+                acc += term
+                
+                count += 4
+                
+                iteration += 1
+                if iteration % 10 == 0:
+                    self.report_progress(None, min(prec_cur, self.precision), prec_cur, 20)
+                    self.checkpoint({"prec_cur": prec_cur, "bits": bits, "second": second,
+                                     "queue_cur": list(queue_cur), "iteration": iteration,
+                                     "series": (term, acc, count), "known": known})
+            if not self.running:
+                break
+            self.profile_event("series", series_start, prec_cur, iteration, 2 * (iteration - series_iteration))
+            
+            if bound:
+                check_start = time.perf_counter_ns()
+                correction = abs(acc - second)
+                correction_digits = (bits - math.log2(int(correction))) / LOG2_10 if correction else float("inf")
+                known = bound_digits(known, correction_digits, prec_cur)
+                self.profile_event("check", check_start, prec_cur, iteration)
+                second = acc
+                if known >= target:
+                    break
+                prec_cur = bound_precision(known, target)
+                new_bits = int(prec_cur * LOG2_10) + FIXPOINT_GUARD_BITS
+                second <<= new_bits - bits
+                bits = new_bits
+                self.checkpoint({"prec_cur": prec_cur, "bits": bits, "second": second,
+                                 "queue_cur": list(queue_cur), "iteration": iteration, "series": None,
+                                 "known": known})
+                continue
+            
+            check_start = time.perf_counter_ns()
+            converged = key(acc) in queue_cur
+            self.profile_event("check", check_start, prec_cur, iteration)
+            if converged:
+                if prec_cur < self.precision:
+                    prec_cur += prec_cur
+                    if prec_cur > self.precision:
+                        prec_cur = self.precision
+                    new_bits = int(prec_cur * LOG2_10) + FIXPOINT_GUARD_BITS
+                    acc <<= new_bits - bits
+                    bits = new_bits
+                else:
+                    second = acc
+                    break
+            
+            qq_append(key(acc))
+            qq_pop(0)
+            second = acc
+            self.checkpoint({"prec_cur": prec_cur, "bits": bits, "second": second,
+                             "queue_cur": list(queue_cur), "iteration": iteration, "series": None})
+        
+        self.iterations = iteration
+        # Scale to a decimal integer with a few guard digits; calculate_pi does the rounding
+        exponent = self.precision + 10
+        with localcontext(exact_context()):
+            return int_to_decimal((second * mpz(10) ** exponent) >> bits).scaleb(-exponent)
+    
+    def calculate_chudnovsky(self):
+        """Sum the Chudnovsky series by binary splitting over exact Decimal integers
+        
+        The term range is cut into blocks that are split independently, so
+        finished blocks can be checkpointed or handed to worker processes,
+        and the blocks are then merged pairwise.
+        """
+        guard_digits = 10
+        prec = self.precision + guard_digits
+        state = self.resume_state
+        if state:
+            bounds = state["bounds"]
+            results = dict(state["results"])
+        else:
+            n_terms = int(self.precision / CHUDNOVSKY_DIGITS_PER_TERM) + 2
+            n_blocks = self.workers * 4 if self.workers > 1 else CHUDNOVSKY_SERIAL_BLOCKS
+            n_blocks = min(n_blocks, n_terms)
+            bounds = [n_terms * i // n_blocks for i in range(n_blocks + 1)]
+            results = {}
+        pending = [i for i in range(len(bounds) - 1) if i not in results]
+        self.iterations = bounds[-1]  # One iteration per series term
+        self.terms_done = sum(bounds[i + 1] - bounds[i] for i in results)
+        self.terms_reported = self.terms_done
+        self.leaves_done = 0
+        
+        # The levels below the blocks form a geometric series
+        n_blocks = len(bounds) - 1
+        split_units = chudnovsky_level_cost(n_blocks) / (1 - 2 ** (1 - DECIMAL_COST_EXPONENT))
+        merge_units = sum(chudnovsky_level_cost(2 ** level) for level in range(max(n_blocks - 1, 0).bit_length()))
+        self.progress_model = ProgressModel(
+            [(self.precision, split_units + merge_units + CHUDNOVSKY_FINAL_MULTIPLICATIONS)], DECIMAL_COST_EXPONENT)
+        self.split_units_per_term = split_units / bounds[-1]
+        
+        if self.workers > 1:
+            split, root = self.parallel_split(bounds, results, pending, prec)
+        else:
+            for i in pending:
+                phase_start = time.perf_counter_ns()
+                with localcontext(exact_context()):
+                    block = self.binary_split(bounds[i], bounds[i + 1])
+                if block is None:
+                    return None
+                results[i] = self.store_block(block, results.values())
+                del block
+                self.profile_event("split-block", phase_start, None, i, bounds[i + 1] - bounds[i])
+                self.checkpoint({"bounds": bounds, "results": dict(results)})
+            
+            split = self.merge_blocks([results.pop(i) for i in range(len(bounds) - 1)])
+            root = None
+        if split is None:
+            return None
+        _, q, t = split
+        
+        with localcontext(exact_context()) as ctx:
+            ctx.prec = prec
+            if root is None:
+                phase_start = time.perf_counter_ns()
+                root = decimal_sqrt(10005, prec)
+                self.profile_event("sqrt", phase_start, prec)
+            phase_start = time.perf_counter_ns()
+            value = q * 426880 * root * decimal_reciprocal(t, prec)
+            self.profile_event("divide", phase_start, prec)
+            return value
+    
+    def parallel_split(self, bounds, results, pending, prec):
+        """Split the pending blocks on a process pool and merge all blocks
+        
+        Blocks are merged pairwise level by level in the pool while one of
+        the workers computes sqrt(10005). Returns ((P, Q, T), sqrt) or
+        (None, None) once stopped.
+        """
+        # Imported here so single-process runs and library callers skip the pool machinery
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        pool = ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        try:
+            phase_start = time.perf_counter_ns()
+            root_future = pool.submit(decimal_sqrt, 10005, prec)
+            futures = {pool.submit(chudnovsky_block, bounds[i], bounds[i + 1]): i for i in pending}
+            for future in as_completed(futures):
+                if not self.running:
+                    return None, None
+                i = futures[future]
+                results[i] = self.store_block(future.result(), results.values())
+                del futures[future]
+                self.checkpoint({"bounds": bounds, "results": dict(results)})
+                
+                self.terms_done += bounds[i + 1] - bounds[i]
+                digits = int(self.terms_done * CHUDNOVSKY_DIGITS_PER_TERM)
+                self.report_progress(None, min(digits, self.precision), self.precision,
+                                     (bounds[i + 1] - bounds[i]) * self.split_units_per_term)
+            
+            self.profile_event("parallel-split", phase_start, None, None, self.terms_done)
+            
+            blocks = [results.pop(i) for i in range(len(bounds) - 1)]
+            if self.max_memory:  # Merged here, so spilled blocks are loaded one pair at a time
+                split = self.merge_blocks(blocks)
+                phase_start = time.perf_counter_ns()
+                root = root_future.result()
+                self.profile_event("sqrt-wait", phase_start, prec)
+                return split, root
+            
+            # The last merge is done here to avoid shipping both halves to a worker
+            while len(blocks) > 2 and self.running:
+                phase_start = time.perf_counter_ns()
+                merged = [pool.submit(chudnovsky_merge, blocks[i], blocks[i + 1])
+                          for i in range(0, len(blocks) - 1, 2)]
+                merged = [future.result() for future in merged]
+                if len(blocks) % 2:
+                    merged.append(blocks[-1])
+                blocks = merged
+                self.profile_event("merge", phase_start, len(blocks))
+                self.report_progress(None, self.precision, self.precision, chudnovsky_level_cost(len(blocks)))
+            if not self.running:
+                return None, None
+            
+            phase_start = time.perf_counter_ns()
+            split = chudnovsky_merge(*blocks, need_p=False) if len(blocks) == 2 else blocks[0]
+            self.profile_event("merge", phase_start, 1)
+            phase_start = time.perf_counter_ns()
+            root = root_future.result()
+            self.profile_event("sqrt-wait", phase_start, prec)
+            return split, root
+        finally:
+            pool.shutdown(wait=self.running, cancel_futures=True)
+    
+    def binary_split(self, a, b):
+        """P, Q, T of the Chudnovsky terms [a, b), or None once stopped"""
+        if b - a <= CHUDNOVSKY_LEAF_TERMS:
+            if not self.running:
+                return None
+            p_ab, q_ab, t_ab = chudnovsky_leaf(a, b)
+            
+            self.terms_done += b - a
+            self.leaves_done += 1
+            if self.leaves_done % 10 == 0:
+                digits = int(self.terms_done * CHUDNOVSKY_DIGITS_PER_TERM)
+                self.report_progress(None, min(digits, self.precision), self.precision,
+                                     (self.terms_done - self.terms_reported) * self.split_units_per_term)
+                self.terms_reported = self.terms_done
+            return Decimal(p_ab), Decimal(q_ab), Decimal(t_ab)
+        
+        m = (a + b) // 2
+        left = self.binary_split(a, m)
+        if left is None:
+            return None
+        right = self.binary_split(m, b)
+        if right is None:
+            return None
+        return chudnovsky_merge(left, right)
+    
+    def store_block(self, block, held):
+        """block, or a SpilledBlock of it once it and the held blocks exceed the low-memory budget"""
+        if not self.max_memory:
+            return block
+        held_bytes = sum(block_bytes(b) for b in held if b is not None and not isinstance(b, SpilledBlock))
+        if held_bytes + block_bytes(block) <= self.max_memory * LOW_MEMORY_HELD_FRACTION:
+            return block
+        
+        if self.spill_dir is None:
+            if self.checkpoint_path:  # Next to the checkpoint, which refers to the spilled blocks
+                self.spill_dir = self.checkpoint_path + SPILL_SUFFIX
+                os.makedirs(self.spill_dir, exist_ok=True)
+            else:
+                self.spill_dir = tempfile.mkdtemp(prefix="pi-", suffix=SPILL_SUFFIX)
+        phase_start = time.perf_counter_ns()
+        fd, path = tempfile.mkstemp(suffix=".pickle", dir=self.spill_dir)
+        os.close(fd)
+        spilled = SpilledBlock(path, block)
+        self.spilled_blocks += 1
+        self.profile_event("spill", phase_start)
+        return spilled
+    
+    def load_block(self, block, keep=False):
+        """The P, Q, T of a held or spilled block; the spill file is removed unless keep"""
+        if not isinstance(block, SpilledBlock):
+            return block
+        phase_start = time.perf_counter_ns()
+        loaded = block.load()
+        if not keep:
+            os.remove(block.path)
+        self.profile_event("load", phase_start)
+        return loaded
+    
+    def remove_spilled(self):
+        """Delete the spill directory, including one left by the run a checkpoint resumed"""
+        spill_dir = self.spill_dir or (self.checkpoint_path and self.checkpoint_path + SPILL_SUFFIX)
+        if spill_dir and os.path.isdir(spill_dir):
+            shutil.rmtree(spill_dir, ignore_errors=True)
+        self.spill_dir = None
+    
+    def merge_blocks(self, blocks):
+        """Merge blocks pairwise level by level into one P, Q, T
+        
+        Each pair is released as soon as it is merged, spilled blocks are
+        loaded only for their own merge and merged blocks go back to disk
+        while over the low-memory budget. The final merge skips P, which the
+        series does not use. Blocks a checkpoint refers to stay on disk.
+        """
+        keep = self.checkpoint_path is not None
+        while len(blocks) > 1:
+            phase_start = time.perf_counter_ns()
+            last = len(blocks) == 2
+            for i in range(0, len(blocks) - 1, 2):
+                left, right = blocks[i], blocks[i + 1]
+                blocks[i] = blocks[i + 1] = None
+                merged = chudnovsky_merge(self.load_block(left, keep), self.load_block(right, keep), not last)
+                del left, right
+                blocks[i // 2] = self.store_block(merged, blocks)
+                del merged
+            if len(blocks) % 2:
+                blocks[len(blocks) // 2] = blocks[-1]
+            del blocks[(len(blocks) + 1) // 2:]
+            keep = False  # Merged blocks are never checkpointed
+            self.profile_event("merge", phase_start, len(blocks))
+            self.report_progress(None, self.precision, self.precision, chudnovsky_level_cost(len(blocks)))
+        return self.load_block(blocks[0], keep)
+    
+    def calculate_agm(self):
+        """Gauss–Legendre iteration on the arithmetic-geometric mean of 1 and 1/sqrt(2)
+        
+        Every step roughly doubles the correct digits. The geometric mean
+        sqrt(a*b) is taken by decimal_sqrt starting from the arithmetic mean,
+        which already agrees with it to twice the digits a and b share, so
+        later steps skip the low levels of its precision-doubling schedule.
+        """
+        guard_digits = 10
+        prec = self.precision + guard_digits
+        state = self.resume_state
+        with localcontext() as ctx:
+            ctx.prec = prec
+            if state:
+                a, b, t, p = state["a"], state["b"], state["t"], state["p"]
+                iteration = state["iteration"]
+            else:
+                a = Decimal(1)
+                b = 1 / decimal_sqrt(2, prec)
+                t = Decimal(1) / 4
+                p = 1
+                iteration = 0
+            limit = Decimal(10) ** -prec
+            steps = int(math.log2(prec)) + 2  # Shared digits double every step, starting from about half a digit
+            self.progress_model = ProgressModel([(prec, steps * AGM_STEP_MULTIPLICATIONS)], DECIMAL_COST_EXPONENT)
+            
+            while self.running and abs(a - b) > limit:
+                shared_digits = -(a - b).adjusted()
+                mean = (a + b) / 2
+                phase_start = time.perf_counter_ns()
+                b = decimal_sqrt(a * b, prec, mean, 2 * shared_digits - 2)
+                self.profile_event("sqrt", phase_start, prec, iteration)
+                phase_start = time.perf_counter_ns()
+                t -= p * (a - mean) ** 2
+                p *= 2
+                a = mean
+                iteration += 1
+                self.profile_event("agm-update", phase_start, prec, iteration)
+                
+                if self.progress_callback:
+                    correct_digits = min(2 * shared_digits, self.precision)
+                    ctx.prec = correct_digits + guard_digits  # Digits past the correct ones are not worth a division
+                    self.report_progress((a + b) ** 2 / (4 * t), correct_digits, prec, AGM_STEP_MULTIPLICATIONS)
+                    ctx.prec = prec
+                self.checkpoint({"a": a, "b": b, "t": t, "p": p, "iteration": iteration})
+            
+            self.iterations = iteration
+            if not self.running:
+                return None
+            return (a + b) ** 2 * decimal_reciprocal(4 * t, prec)
+    
+    def stop(self):
+        self.running = False
+
+def format_time(seconds):
+    """Format seconds into HH:MM:SS.ms"""
+    if seconds is None:
+        return "--:--:--.---"
+    
+    # Split into whole seconds and milliseconds
+    whole_seconds = int(seconds)
+    milliseconds = int((seconds - whole_seconds) * 1000)
+    
+    # Format main time part
+    time_str = str(timedelta(seconds=whole_seconds))
+    # Add milliseconds
+    return f"{time_str}.{milliseconds:03d}"
@@ -0,0 +1,145 @@
+from decimal import localcontext
+from array import array
+import os
+import sys
+import mmap
+import struct
+import zlib
+
+from .engine import exact_context, coefficient_chunks, OUTPUT_CHUNK_DIGITS
+
+# Packed format: a header, the digits as little-endian uint64 words of 19 digits (the last one
+# zero-padded), then a CRC32 per block of words so a read only checks the blocks it touches
+PACKED_MAGIC = b"PIPACKED"
+PACKED_VERSION = 1
+PACKED_HEADER = struct.Struct("<8sHHIQQQ")  # magic, version, digits per word, block words, point, digits, index offset
+PACKED_DIGITS_PER_WORD = 19
+PACKED_BLOCK_WORDS = 4096
+OUTPUT_FORMATS = ("text", "packed")
+
+def pack_words(digit_text):
+    """Turn a digit string whose length is a multiple of PACKED_DIGITS_PER_WORD into uint64 words"""
+    words = array("Q", [int(digit_text[i:i + PACKED_DIGITS_PER_WORD])
+                        for i in range(0, len(digit_text), PACKED_DIGITS_PER_WORD)])
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+def write_packed(value, digits, filename):
+    """Write a positive value with digits significant digits in the packed format"""
+    adjusted = value.adjusted()
+    if not value.is_finite() or value.is_signed() or adjusted < 0 or digits <= adjusted:
+        raise ValueError("Packed format needs a positive value with an integer part")
+    with localcontext(exact_context()):
+        coefficient = value.scaleb(digits - 1 - adjusted).to_integral_value()
+    
+    checksums = array("I")
+    temp_path = filename + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(bytes(PACKED_HEADER.size))
+        pending = ""
+        block = array("Q")
+        for chunk in coefficient_chunks(coefficient, digits, OUTPUT_CHUNK_DIGITS):
+            pending += chunk
+            whole = len(pending) - len(pending) % PACKED_DIGITS_PER_WORD
+            block.extend(pack_words(pending[:whole]))
+            pending = pending[whole:]
+            while len(block) >= PACKED_BLOCK_WORDS:
+                data = block[:PACKED_BLOCK_WORDS].tobytes()
+                f.write(data)
+                checksums.append(zlib.crc32(data))
+                del block[:PACKED_BLOCK_WORDS]
+        if pending:
+            block.extend(pack_words(pending.ljust(PACKED_DIGITS_PER_WORD, "0")))
+        if block:
+            data = block.tobytes()
+            f.write(data)
+            checksums.append(zlib.crc32(data))
+        
+        index_offset = f.tell()
+        if sys.byteorder == "big":
+            checksums.byteswap()
+        f.write(checksums.tobytes())
+        f.seek(0)
+        f.write(PACKED_HEADER.pack(PACKED_MAGIC, PACKED_VERSION, PACKED_DIGITS_PER_WORD,
+                                   PACKED_BLOCK_WORDS, adjusted + 1, digits, index_offset))
+    os.replace(temp_path, filename)
+
+class PackedDigits:
+    """Random access to the digits of a packed file through a memory map
+    
+    Digits are numbered from 0 over the whole number, integer part first,
+    so for π digit 0 is the 3 and the decimal point sits before digit point.
+    """
+    
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise ValueError(f"Not a packed digits file: {path}")
+        if len(self.map) < PACKED_HEADER.size or self.map[:len(PACKED_MAGIC)] != PACKED_MAGIC:
+            self.map.close()
+            raise ValueError(f"Not a packed digits file: {path}")
+        
+        (_, version, digits_per_word, self.block_words, self.point, self.digits,
+         self.index_offset) = PACKED_HEADER.unpack_from(self.map)
+        if version != PACKED_VERSION or digits_per_word != PACKED_DIGITS_PER_WORD:
+            self.map.close()
+            raise ValueError(f"Unsupported packed digits version: {version}")
+        words = -(-self.digits // PACKED_DIGITS_PER_WORD)
+        self.blocks = -(-words // self.block_words)
+        if self.index_offset != PACKED_HEADER.size + 8 * words or len(self.map) < self.index_offset + 4 * self.blocks:
+            self.map.close()
+            raise ValueError(f"Truncated packed digits file: {path}")
+        self.checked = set()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        self.map.close()
+    
+    def check_block(self, block):
+        """Compare a block of words against its CRC32, once per block"""
+        if block in self.checked:
+            return
+        start = PACKED_HEADER.size + 8 * block * self.block_words
+        end = min(start + 8 * self.block_words, self.index_offset)
+        expected = int.from_bytes(self.map[self.index_offset + 4 * block:self.index_offset + 4 * block + 4], "little")
+        if zlib.crc32(self.map[start:end]) != expected:
+            raise ValueError(f"Packed digits block {block} is corrupt")
+        self.checked.add(block)
+    
+    def read(self, start, count):
+        """Return up to count digits starting at digit start"""
+        end = min(start + count, self.digits)
+        if start < 0 or count < 0:
+            raise ValueError("Digit range must not be negative")
+        if start >= end:
+            return ""
+        
+        first_word = start // PACKED_DIGITS_PER_WORD
+        last_word = (end - 1) // PACKED_DIGITS_PER_WORD
+        for block in range(first_word // self.block_words, last_word // self.block_words + 1):
+            self.check_block(block)
+        words = array("Q")
+        words.frombytes(self.map[PACKED_HEADER.size + 8 * first_word:PACKED_HEADER.size + 8 * (last_word + 1)])
+        if sys.byteorder == "big":
+            words.byteswap()
+        text = "".join([f"{word:019d}" for word in words])
+        offset = first_word * PACKED_DIGITS_PER_WORD
+        return text[start - offset:end - offset]
+    
+    def text_chunks(self):
+        """Yield the number as plain text, the same as the text format would hold"""
+        chunk_digits = self.block_words * PACKED_DIGITS_PER_WORD
+        for start in range(0, self.digits, chunk_digits):
+            chunk = self.read(start, chunk_digits)
+            if start < self.point <= start + len(chunk) and self.point < self.digits:
+                cut = self.point - start
+                chunk = chunk[:cut] + "." + chunk[cut:]
+            yield chunk
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from . import compute
+from .engine import DigitCache, DEFAULT_CACHE_MAX_BYTES
+
+# Digit server: results are computed this many digits past the largest request so the served
+# digits are final, at precisions rounded up to a power of two so nearby requests share a run
+SERVE_GUARD_DIGITS = 20
+SERVE_MAX_DIGITS = 100_000_000
+
+def serve_compute(digits, engine, workers, cache_dir, cache_max_bytes):
+    """π to digits digits as ASCII text, run in the digit server's executor process"""
+    return str(compute(digits, engine, workers=workers, cache_dir=cache_dir,
+                       cache_max_bytes=cache_max_bytes)).encode("ascii")
+
+def parse_address(address):
+    """("unix", path) for an address containing a slash, otherwise ("tcp", (host, port))"""
+    if "/" in address:
+        return "unix", address
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+class DigitServer:
+    """Answers PREFIX and RANGE requests over asyncio streams from one shared digit store
+    
+    The store is the text of the largest result so far, a memory-mapped
+    cache file at startup. Requests past it wait for a computation on the
+    executor, and every request a pending computation covers awaits that
+    same computation instead of starting its own.
+    
+    Protocol, one request per line:
+        PREFIX n    the first n digits with the decimal point, truncated: the last
+                    digit is π's own, where pi.txt rounds it
+        RANGE a b   digits a to b-1, numbered from 0 with the 3 as digit 0
+        STATS       counters as JSON
+    Replies are "OK <length>" and the payload on the next line, or "ERR <reason>".
+    """
+    
+    def __init__(self, engine, workers=1, cache_dir=None, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.engine = engine
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.text = b""
+        self.valid = 0  # Digits of text that are final
+        self.pending = {}  # digits -> future of a running computation
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.stats = {"requests": 0, "errors": 0, "computations": 0, "coalesced": 0}
+        
+        if cache_dir:
+            entries = DigitCache(cache_dir, cache_max_bytes).entries()
+            if entries:
+                stored, path = entries[-1]
+                with open(path, "rb") as f:
+                    self.text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.valid = max(stored - SERVE_GUARD_DIGITS, 0)
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.close_text()
+    
+    def close_text(self):
+        """Unmap the store if it is still the cache file mapped at startup"""
+        if isinstance(self.text, mmap.mmap):
+            self.text.close()
+    
+    async def ensure(self, digits):
+        """Wait until the store holds digits final digits"""
+        while self.valid < digits:
+            future = next((f for pending, f in self.pending.items() if pending - SERVE_GUARD_DIGITS >= digits), None)
+            if future is None:
+                target = 1 << (digits + SERVE_GUARD_DIGITS - 1).bit_length()
+                future = self.pending[target] = asyncio.ensure_future(self.compute(target))
+            else:
+                self.stats["coalesced"] += 1
+            await asyncio.shield(future)  # A client hanging up must not cancel a shared computation
+    
+    async def compute(self, digits):
+        self.stats["computations"] += 1
+        try:
+            text = await asyncio.get_running_loop().run_in_executor(
+                self.executor, serve_compute, digits, self.engine, self.workers, self.cache_dir,
+                self.cache_max_bytes)
+            if digits - SERVE_GUARD_DIGITS > self.valid:
+                self.close_text()
+                self.text = text
+                self.valid = digits - SERVE_GUARD_DIGITS
+        finally:
+            del self.pending[digits]
+    
+    def read(self, start, stop):
+        """Digits start to stop-1 of the store, skipping the decimal point"""
+        if stop <= 1:
+            return bytes(self.text[start:stop])
+        if start == 0:
+            return bytes(self.text[:1]) + bytes(self.text[2:stop + 1])
+        return bytes(self.text[start + 1:stop + 1])
+    
+    async def respond(self, words):
+        command = words[0].upper() if words else ""
+        if command == "PREFIX" and len(words) == 2:
+            digits = int(words[1])
+            if not 1 <= digits <= SERVE_MAX_DIGITS:
+                raise ValueError(f"digits must be between 1 and {SERVE_MAX_DIGITS}")
+            await self.ensure(digits)
+            return bytes(self.text[:digits + 1 if digits > 1 else 1])
+        if command == "RANGE" and len(words) == 3:
+            start, stop = int(words[1]), int(words[2])
+            if not 0 <= start < stop <= SERVE_MAX_DIGITS:
+                raise ValueError(f"range must satisfy 0 <= a < b <= {SERVE_MAX_DIGITS}")
+            await self.ensure(stop)
+            return self.read(start, stop)
+        if command == "STATS" and len(words) == 1:
+            return json.dumps(dict(self.stats, digits=self.valid, pending=sorted(self.pending))).encode()
+        raise ValueError("expected PREFIX n, RANGE a b or STATS")
+    
+    async def handle(self, reader, writer):
+        """Serve one connection until the client closes it"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.stats["requests"] += 1
+                try:
+                    payload = await self.respond(line.decode("ascii", "replace").split())
+                    writer.write(b"OK %d\n%s\n" % (len(payload), payload))
+                except Exception as e:  # Bad request or failed computation, the connection stays usable
+                    self.stats["errors"] += 1
+                    writer.write(f"ERR {str(e)}\n".encode("ascii", "replace"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(address, server):
+    """Listen on address until cancelled"""
+    kind, where = parse_address(address)
+    if kind == "unix":
+        listener = await asyncio.start_unix_server(server.handle, path=where)
+    else:
+        listener = await asyncio.start_server(server.handle, *where)
+    print(f"Serving π digits on {address} ({server.engine}, {server.valid} digits ready)")
+    async with listener:
+        await listener.serve_forever()